@@ -0,0 +1,53 @@
+"""
+asyncio front end for Monday.com calls
+
+Calls still go through the blocking, guarded request path (complexity
+scheduler, deadline, retries and circuit breaker), each one in a worker
+thread, so independent mutations can be awaited together while a semaphore
+bounds how many are in flight. Worker threads run in a copy of the caller's
+context, so request ids, priorities and deadlines carry over.
+"""
+import os
+import logging
+
+from profiling import run_profiled
+
+logger = logging.getLogger(__name__)
+
+# Calls in flight at once per client (keep at or below MONDAY_POOL_SIZE)
+MONDAY_ASYNC_CONCURRENCY = int(os.environ.get("MONDAY_ASYNC_CONCURRENCY", "8"))
+
+
+def load_asyncio():
+    """
+    The asyncio module, imported on first use
+    Importing it is a noticeable part of a cold start, so nothing imports it at module level
+    """
+    import asyncio
+    return asyncio
+
+
+class AsyncMondayClient:
+    """
+    Awaitable Monday.com client with bounded concurrency
+
+    `send(query, variables)` is the blocking call that returns the decoded
+    response (make_monday_api_request). Create one client per event loop.
+    """
+
+    def __init__(self, send, concurrency=MONDAY_ASYNC_CONCURRENCY):
+        self.send = send
+        self.concurrency = max(1, concurrency)
+        asyncio = load_asyncio()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._to_thread = asyncio.to_thread
+
+    async def call(self, func, *args):
+        """Run a blocking Monday.com helper in a worker thread under the concurrency limit"""
+        async with self._semaphore:
+            # run_profiled adds the worker thread to the request's profile, if there is one
+            return await self._to_thread(run_profiled, func, *args)
+
+    async def execute(self, query, variables=None):
+        """Run a GraphQL document and return the decoded response"""
+        return await self.call(self.send, query, variables)
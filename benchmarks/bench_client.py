@@ -0,0 +1,58 @@
+"""
+Benchmark: per-call requests.post versus the pooled MondayClient
+
+Run from the repository root:
+    python -m benchmarks.bench_client --calls 200
+"""
+import argparse
+import time
+import requests
+
+from monday_client import MondayClient
+from benchmarks.mock_monday import MockMondayServer
+
+QUERY = "query { me { id name email } }"
+
+
+def run_unpooled(server, calls):
+    for _ in range(calls):
+        response = requests.post(server.url, json={"query": QUERY, "variables": {}},
+                                 headers={"Authorization": "Bearer test"})
+        response.raise_for_status()
+        response.json()
+
+
+def run_pooled(server, calls):
+    client = MondayClient("test", server.url)
+    try:
+        for _ in range(calls):
+            client.execute(QUERY)
+    finally:
+        client.close()
+
+
+def measure(name, runner, server, calls):
+    server.reset_stats()
+    start = time.perf_counter()
+    runner(server, calls)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22} {calls} calls in {elapsed:.3f}s "
+          f"({elapsed / calls * 1000:.2f} ms/call), "
+          f"{server.connections} connection(s) for {server.requests} request(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server = MockMondayServer().start()
+    try:
+        measure("requests.post", run_unpooled, server, args.calls)
+        measure("MondayClient (pooled)", run_pooled, server, args.calls)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
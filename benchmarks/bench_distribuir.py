@@ -0,0 +1,86 @@
+"""
+Benchmark: end-to-end /distribuir webhooks against a synthetic board
+
+Starts the mock Monday.com server, points the app at it and posts webhooks
+through the Flask test client, one parent item per webhook. Reports
+throughput, p50/p99 latency, API calls and mutations per webhook.
+
+Run from the repository root:
+    python -m benchmarks.bench_distribuir --subitems 10 100 1000 --webhooks 20
+"""
+import os
+import sys
+import time
+import uuid
+import argparse
+import tempfile
+
+from benchmarks.mock_monday import MockMondayServer, SyntheticBoard
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def webhook_payload(item):
+    return {"event": {"pulseId": int(item["id"]), "pulseName": item["name"], "triggerUuid": uuid.uuid4().hex}}
+
+
+def run(app, server, subitems, webhooks, extra_columns):
+    server.board = SyntheticBoard(parents=webhooks, subitems=subitems, extra_columns=extra_columns)
+    server.reset_stats()
+    client = app.test_client()
+
+    latencies = []
+    statuses = {}
+    start = time.perf_counter()
+    for parent_id in server.board.parent_ids:
+        payload = webhook_payload(server.board.items[parent_id])
+        sent = time.perf_counter()
+        response = client.post("/distribuir", json=payload)
+        latencies.append(time.perf_counter() - sent)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{subitems:>5} subitems: {webhooks / elapsed:7.2f} webhooks/s, "
+          f"p50 {percentile(latencies, 0.5) * 1000:8.2f} ms, p99 {percentile(latencies, 0.99) * 1000:8.2f} ms, "
+          f"{server.requests / webhooks:6.2f} API calls/webhook, "
+          f"{len(server.mutations) / webhooks:7.2f} mutations/webhook, "
+          f"{server.connections} new connection(s), statuses {statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subitems", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--webhooks", type=int, default=20)
+    parser.add_argument("--extra-columns", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every API call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of API calls failing with 500")
+    args = parser.parse_args()
+
+    server = MockMondayServer(latency=args.latency, error_rate=args.error_rate).start()
+
+    # The app reads its configuration at import time
+    os.environ["MONDAY_API_URL"] = server.url
+    os.environ.setdefault("MONDAY_API_TOKEN", "benchmark")
+    # Keep the synthetic items out of the real operation store and mutation journal
+    directory = tempfile.mkdtemp()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{directory}/operations.db")
+    os.environ.setdefault("MUTATION_JOURNAL_PATH", f"{directory}/mutation_journal.db")
+    os.environ.setdefault("MUTATION_JOURNAL_RESUME_ON_STARTUP", "0")
+    os.environ.setdefault("WEBHOOK_COALESCE_WINDOW", "0")
+    os.environ.setdefault("DISTRIBUIR_ASYNC", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from index import app
+
+    try:
+        for subitems in args.subitems:
+            run(app, server, subitems, args.webhooks, args.extra_columns)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
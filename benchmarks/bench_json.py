@@ -0,0 +1,104 @@
+"""
+Benchmark: decoding large Monday.com board responses
+
+Builds a multi-megabyte items_page response from a synthetic board and
+compares the old path (response.text for logging plus response.json()),
+a single stdlib decode from bytes, json_codec.loads and the incremental
+json_codec.iter_page parse, including peak memory.
+
+Run from the repository root:
+    python -m benchmarks.bench_json --items 40 --subitems 250
+"""
+import io
+import json
+import time
+import argparse
+import tracemalloc
+
+import requests
+
+import json_codec
+from benchmarks.mock_monday import SyntheticBoard
+
+PAGE_PATH = "data.boards.item.items_page"
+
+
+def board_response(items, subitems, extra_columns):
+    board = SyntheticBoard(parents=items, subitems=subitems, extra_columns=extra_columns)
+    selection = "id name group column_values board subitems"
+    page = {"cursor": None, "items": [board.render(board.items[parent_id], selection, None)
+                                      for parent_id in board.parent_ids]}
+    document = {"data": {"complexity": {"before": 10_000_000, "after": 9_990_000, "reset_in_x_seconds": 60},
+                         "boards": [{"items_page": page}]}}
+    return json.dumps(document).encode()
+
+
+def as_response(body):
+    response = requests.models.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = body
+    return response
+
+
+def old_path(body):
+    response = as_response(body)
+    len(response.text)
+    return response.json()
+
+
+def stdlib_bytes(body):
+    return json.loads(body)
+
+
+def codec_loads(body):
+    return json_codec.loads(body)
+
+
+def streamed(body):
+    count = 0
+    for kind, _ in json_codec.iter_page(io.BytesIO(body), PAGE_PATH):
+        count += kind == "item"
+    return count
+
+
+def first_item(body):
+    for kind, value in json_codec.iter_page(io.BytesIO(body), PAGE_PATH):
+        if kind == "item":
+            return value
+
+
+def measure(name, func, body, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(body)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    func(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name:<28} {elapsed * 1000:9.2f} ms   peak {peak / 1_048_576:7.2f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--subitems", type=int, default=250)
+    parser.add_argument("--extra-columns", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = board_response(args.items, args.subitems, args.extra_columns)
+    print(f"Response: {len(body) / 1_048_576:.2f} MiB, {args.items} items x {args.subitems} subitems, "
+          f"backend {json_codec.BACKEND}, streaming {json_codec.STREAMING_BACKEND or 'off'}")
+
+    measure("text + response.json()", old_path, body, args.repeat)
+    measure("json.loads(bytes)", stdlib_bytes, body, args.repeat)
+    measure("json_codec.loads", codec_loads, body, args.repeat)
+    measure("json_codec.iter_page (all)", streamed, body, args.repeat)
+    measure("json_codec.iter_page (first)", first_item, body, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
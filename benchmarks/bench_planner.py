@@ -0,0 +1,65 @@
+"""
+Benchmark: pure distribution planning on large synthetic boards
+
+Run from the repository root:
+    python -m benchmarks.bench_planner --subitems 100 1000 10000 --extra-columns 30
+"""
+import argparse
+import time
+
+from models import Item
+from planner import plan_distribution
+
+
+def synthetic_item(subitem_count, extra_columns=0):
+    """API-shaped parent item whose limit covers roughly half of its subitems"""
+    subitems = []
+    for index in range(subitem_count):
+        subitems.append({
+            "id": str(10_000 + index),
+            "name": f"Subitem {index}",
+            "board": {"id": "9431861361"},
+            "column_values": [
+                {"id": "dropdown_mks6gqg0", "value": None,
+                 "text": "Parte Aérea Internacional" if index % 3 else "Outro"},
+                {"id": "numeric_mks6p0bv", "value": None, "text": ""},
+                {"id": "numeric_mks6ywg8", "value": f'"{100 + index % 7}"', "text": ""},
+                {"id": "numeric_mks6myhs", "value": f'"{50 + index % 5}"', "text": ""},
+                *({"id": f"text_extra{column}", "value": f'"note {column}"', "text": f"note {column}"}
+                  for column in range(extra_columns))
+            ]
+        })
+    return {
+        "id": "1",
+        "name": "Synthetic",
+        "column_values": [
+            {"id": "numeric_mks63qc1", "value": '"42"'},
+            {"id": "numeric_mks64nh2", "value": '"0"'},
+            {"id": "color_mks7xywc", "value": '{"ids":[1]}'},
+            {"id": "numeric_mks61nvq", "value": f'"{103 * subitem_count / 3 + 50}"'}
+        ],
+        "subitems": subitems
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subitems", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--extra-columns", type=int, default=0, help="unrelated columns per subitem")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for count in args.subitems:
+        data = synthetic_item(count, args.extra_columns)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            # Models are built per run, as they are for every webhook
+            item = Item.from_api(data, include_subitems=True)
+            plan = plan_distribution(item, item.subitems)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"{count:>6} subitems: {elapsed * 1000:8.2f} ms/plan, "
+              f"{len(plan['operations'])} operations, status {plan['status']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: cold start to first webhook response, with and without serverless mode
+
+Each run starts a fresh interpreter that imports the app and posts one
+/distribuir webhook, then a second one on the now warm process. The mock
+Monday.com server delays every new connection by --connect-latency to
+stand in for the DNS lookup and TLS handshake of the real API. Reports
+medians of import time, first-webhook latency, import-to-first-response and
+warm latency for SERVERLESS=0 and SERVERLESS=1.
+
+Run from the repository root:
+    python -m benchmarks.cold_start --runs 10 --connect-latency 0.15 --latency 0.05
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from benchmarks.bench_distribuir import webhook_payload
+from benchmarks.mock_monday import MockMondayServer, SyntheticBoard
+
+# Runs in the fresh interpreter; timing starts before the app is imported
+CHILD = """
+import time
+start = time.perf_counter()
+import sys, json
+import index
+imported = time.perf_counter()
+time.sleep(float(sys.argv[1]))
+client = index.app.test_client()
+cold, warm = json.loads(sys.argv[2])
+sent = time.perf_counter()
+status = client.post("/distribuir", json=cold).status_code
+first = time.perf_counter()
+client.post("/distribuir", json=warm)
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_ms": (first - sent) * 1000,
+    "import_to_first_ms": (first - start) * 1000 - float(sys.argv[1]) * 1000,
+    "warm_ms": (time.perf_counter() - first) * 1000,
+    "status": status
+}))
+"""
+
+
+def run_once(server, serverless, gap, subitems):
+    server.board = SyntheticBoard(parents=2, subitems=subitems)
+    cold, warm = (webhook_payload(server.board.items[parent_id]) for parent_id in server.board.parent_ids)
+    directory = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        SERVERLESS="1" if serverless else "0",
+        MONDAY_API_URL=server.url,
+        MONDAY_API_TOKEN="benchmark",
+        DATABASE_URL=f"sqlite:///{directory}/operations.db",
+        MUTATION_JOURNAL_PATH=f"{directory}/mutation_journal.db",
+        WEBHOOK_COALESCE_WINDOW="0",
+        DISTRIBUIR_ASYNC="false",
+        LOG_LEVEL="WARNING"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", CHILD, str(gap), json.dumps([cold, warm])],
+                            cwd=root, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--subitems", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every API call")
+    parser.add_argument("--connect-latency", type=float, default=0.15, help="seconds added to every new connection")
+    parser.add_argument("--gap", type=float, default=0.0, help="seconds between import and the first webhook")
+    args = parser.parse_args()
+
+    server = MockMondayServer(latency=args.latency, connect_latency=args.connect_latency).start()
+    try:
+        for serverless in (False, True):
+            results = [run_once(server, serverless, args.gap, args.subitems) for _ in range(args.runs)]
+            medians = {key: statistics.median(result[key] for result in results)
+                       for key in ("import_ms", "first_ms", "import_to_first_ms", "warm_ms")}
+            statuses = sorted({result["status"] for result in results})
+            print(f"SERVERLESS={int(serverless)}: import {medians['import_ms']:7.1f} ms, "
+                  f"first webhook {medians['first_ms']:7.1f} ms, "
+                  f"import to first response {medians['import_to_first_ms']:7.1f} ms, "
+                  f"warm webhook {medians['warm_ms']:7.1f} ms, statuses {statuses}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
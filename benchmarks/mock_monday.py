@@ -0,0 +1,437 @@
+"""
+Local stand-in for the Monday.com GraphQL API used by the benchmarks
+
+Speaks HTTP/1.1 with keep-alive so client connection reuse can be observed,
+and counts how many TCP connections and requests it has served. With a
+SyntheticBoard attached it answers the queries and mutations the webhook
+service sends (items, items_page / next_items_page, change_column_value,
+change_simple_column_value, duplicate_item, delete_item), applies them to
+the in-memory board and records every mutation it receives. Latency and
+error rates can be injected to simulate a slow or flaky API, and a
+per-connection delay stands in for the DNS lookup and TLS handshake
+of a new connection to the real API.
+"""
+import re
+import json
+import time
+import random
+import socket
+import itertools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ITEM_BOARD_ID = "9431708170"
+SUBITEM_BOARD_ID = "9431861361"
+
+ELIGIBLE_TIPOS = ("Parte Aérea Internacional", "Parte Terrestre Internacional")
+OTHER_TIPOS = ("Hospedagem", "Seguro Viagem")
+# Dropdown labels by id, so written {"ids": [...]} values get their text back
+DROPDOWN_LABELS = dict(enumerate(ELIGIBLE_TIPOS + OTHER_TIPOS, start=1))
+EXTRA_COLUMN_TYPES = ("text", "date", "status", "long_text")
+
+# Complexity reported per root field, so the client scheduler sees realistic numbers
+FIELD_COMPLEXITY = 1000
+COMPLEXITY_BUDGET = 10_000_000
+
+_HEADER = re.compile(r"^\s*(?:(\w+)\s*:\s*)?(\w+)\s*(?:\((.*)\))?\s*$", re.DOTALL)
+_ARGUMENT = re.compile(r'(\w+)\s*:\s*(\$\w+|"(?:[^"\\]|\\.)*"|\[[^\]]*\]|-?\d+(?:\.\d+)?|true|false|null)')
+_COLUMN_IDS = re.compile(r"column_values\s*(?:\(\s*ids\s*:\s*(\[[^\]]*\])\s*\))?\s*\{")
+
+
+def root_fields(query):
+    """
+    Split a GraphQL document into its root fields
+
+    Returns (alias, name, raw_arguments, selection) tuples. Only the subset
+    of GraphQL the service sends is supported: every root field has a
+    selection set and arguments contain no braces.
+    """
+    body_start = query.index("{") + 1
+    fields = []
+    header_start = body_start
+    depth = 0
+    for position in range(body_start, len(query)):
+        char = query[position]
+        if char == "{":
+            if depth == 0:
+                header = query[header_start:position]
+                selection_start = position + 1
+            depth += 1
+        elif char == "}":
+            if depth == 0:
+                break
+            depth -= 1
+            if depth == 0:
+                match = _HEADER.match(header)
+                if match:
+                    alias, name, arguments = match.groups()
+                    fields.append((alias or name, name, arguments or "", query[selection_start:position]))
+                header_start = position + 1
+    return fields
+
+
+def parse_arguments(raw_arguments, variables):
+    """Resolve `name: $variable` and literal arguments of a field call"""
+    arguments = {}
+    for name, raw in _ARGUMENT.findall(raw_arguments):
+        arguments[name] = variables.get(raw[1:]) if raw.startswith("$") else json.loads(raw)
+    return arguments
+
+
+def column_projection(selection):
+    """Column ids requested anywhere in a selection (None means every column)"""
+    requested = set()
+    for ids in _COLUMN_IDS.findall(selection):
+        if not ids:
+            return None
+        requested.update(json.loads(ids))
+    return requested
+
+
+class GraphQLError(Exception):
+    """Field-level error reported in the `errors` list with the field's path"""
+
+
+def _column(column_id, column_type, value=None, text=""):
+    return {"id": column_id, "type": column_type, "value": value, "text": text}
+
+
+def _dropdown(column_id, label):
+    label_id = next(key for key, value in DROPDOWN_LABELS.items() if value == label)
+    return _column(column_id, "dropdown", json.dumps({"ids": [label_id]}), label)
+
+
+def _numeric(column_id, number):
+    return _column(column_id, "numbers", json.dumps(str(number)), str(number))
+
+
+class SyntheticBoard:
+    """
+    In-memory parent board with subitems shaped like the real financial board
+
+    Every parent gets `subitems` subitems; roughly two thirds have an
+    eligible tipo and the parent's limit covers about half of them, so each
+    distribution updates a run of subitems and splits one in two.
+    `extra_columns` adds unrelated text/date/status columns to every row to
+    make payloads heavier.
+    """
+
+    def __init__(self, parents=1, subitems=10, extra_columns=4, group_id="topics", seed=0):
+        self.parents = parents
+        self.subitem_count = subitems
+        self.extra_columns = extra_columns
+        self.group_id = group_id
+        self.seed = seed
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Regenerate the board from the seed"""
+        with self.lock:
+            self.random = random.Random(self.seed)
+            self.ids = itertools.count(1_000_000)
+            self.items = {}
+            self.cursors = {}
+            self.cursor_ids = itertools.count(1)
+            self.parent_ids = [self._create_parent(index) for index in range(self.parents)]
+
+    def _extra_columns(self):
+        columns = []
+        for index in range(self.extra_columns):
+            column_type = EXTRA_COLUMN_TYPES[index % len(EXTRA_COLUMN_TYPES)]
+            text = f"{column_type} {self.random.randint(0, 9999)}"
+            columns.append(_column(f"{column_type}_extra{index}", column_type, json.dumps(text), text))
+        return columns
+
+    def _create_parent(self, index):
+        parent_id = str(next(self.ids))
+        subitem_ids = []
+        eligible_deductions = []
+        for position in range(self.subitem_count):
+            subitem_id = str(next(self.ids))
+            eligible = position % 3 != 2
+            tipo = ELIGIBLE_TIPOS[position % 2] if eligible else OTHER_TIPOS[position % 2]
+            euro = 100 + self.random.randint(0, 6)
+            if eligible:
+                eligible_deductions.append(euro)
+            self.items[subitem_id] = {
+                "id": subitem_id,
+                "name": f"Subitem {index}-{position}",
+                "board_id": SUBITEM_BOARD_ID,
+                "parent_id": parent_id,
+                "column_values": [
+                    _dropdown("dropdown_mks6gqg0", tipo),
+                    _column("numeric_mks6p0bv", "numbers"),
+                    _numeric("numeric_mks6ywg8", euro),
+                    _numeric("numeric_mks6myhs", 50 + self.random.randint(0, 4)),
+                    *self._extra_columns()
+                ]
+            }
+            subitem_ids.append(subitem_id)
+
+        # Cover the first half of the eligible subitems plus part of the next one
+        covered = len(eligible_deductions) // 2
+        limit = sum(eligible_deductions[:covered]) + (50 if covered < len(eligible_deductions) else 0)
+        self.items[parent_id] = {
+            "id": parent_id,
+            "name": f"Synthetic item {index}",
+            "board_id": ITEM_BOARD_ID,
+            "group": {"id": self.group_id, "title": "Synthetic group"},
+            "subitem_ids": subitem_ids,
+            "column_values": [
+                _numeric("numeric_mks63qc1", 42),
+                _numeric("numeric_mks64nh2", 0),
+                _column("color_mks7xywc", "dropdown", '{"ids":[1]}', "€ EURO"),
+                _numeric("numeric_mks61nvq", limit),
+                *self._extra_columns()
+            ]
+        }
+        return parent_id
+
+    # Rendering
+
+    def _get(self, item_id):
+        item = self.items.get(str(item_id))
+        if item is None:
+            raise GraphQLError(f"Item {item_id} not found")
+        return item
+
+    def render(self, item, selection, columns):
+        rendered = {"id": item["id"], "name": item["name"]}
+        if "board" in selection:
+            rendered["board"] = {"id": item["board_id"]}
+        if "group" in selection and "group" in item:
+            rendered["group"] = item["group"]
+        if "column_values" in selection:
+            rendered["column_values"] = [dict(column) for column in item["column_values"]
+                                         if columns is None or column["id"] in columns]
+        if "subitems" in selection and "subitem_ids" in item:
+            rendered["subitems"] = [self.render(self.items[subitem_id], "board column_values", columns)
+                                    for subitem_id in item["subitem_ids"]]
+        return rendered
+
+    def _matches(self, item, rules):
+        for rule in rules:
+            values = [str(value) for value in rule.get("compare_value", [])]
+            if rule.get("column_id") == "group" and item.get("group", {}).get("id") not in values:
+                return False
+            if rule.get("column_id") == "name" and item["name"] not in values:
+                return False
+        return True
+
+    def _page(self, item_ids, offset, limit, selection):
+        page_ids = item_ids[offset:offset + limit]
+        cursor = None
+        if offset + limit < len(item_ids):
+            cursor = f"cursor-{next(self.cursor_ids)}"
+            self.cursors[cursor] = (item_ids, offset + limit)
+        columns = column_projection(selection)
+        return {"cursor": cursor, "items": [self.render(self.items[item_id], selection, columns)
+                                            for item_id in page_ids if item_id in self.items]}
+
+    # Root fields
+
+    def items_field(self, arguments, selection):
+        columns = column_projection(selection)
+        return [self.render(self.items[str(item_id)], selection, columns)
+                for item_id in arguments.get("ids") or [] if str(item_id) in self.items]
+
+    def boards_field(self, arguments, selection):
+        page_match = re.search(r"items_page\s*\(([^)]*)\)\s*\{", selection)
+        board = {"id": ITEM_BOARD_ID, "name": "Synthetic board"}
+        if page_match:
+            page_arguments = parse_arguments(page_match.group(1), self.variables)
+            rules = (page_arguments.get("query_params") or {}).get("rules", [])
+            matching = [parent_id for parent_id in self.parent_ids
+                        if self._matches(self.items[parent_id], rules)]
+            board["items_page"] = self._page(matching, 0, page_arguments.get("limit", 25),
+                                             selection[page_match.end():])
+        return [board]
+
+    def next_items_page_field(self, arguments, selection):
+        entry = self.cursors.pop(arguments.get("cursor"), None)
+        if entry is None:
+            raise GraphQLError("Cursor expired or invalid")
+        return self._page(entry[0], entry[1], arguments.get("limit", 25), selection)
+
+    def change_column_value_field(self, arguments, selection):
+        item = self._get(arguments["item_id"])
+        parsed = json.loads(arguments["value"])
+        self._set_column(item, arguments["column_id"], parsed)
+        return {"id": item["id"]}
+
+    def change_simple_column_value_field(self, arguments, selection):
+        item = self._get(arguments["item_id"])
+        if arguments["column_id"] == "name":
+            item["name"] = arguments["value"]
+        else:
+            self._set_column(item, arguments["column_id"], arguments["value"])
+        return {"id": item["id"]}
+
+    def _set_column(self, item, column_id, parsed):
+        for column in item["column_values"]:
+            if column["id"] == column_id:
+                if column["type"] == "numbers":
+                    column["value"], column["text"] = json.dumps(str(parsed)), str(parsed)
+                elif column["type"] == "dropdown" and isinstance(parsed, dict):
+                    labels = [DROPDOWN_LABELS.get(label_id, str(label_id)) for label_id in parsed.get("ids", [])]
+                    column["value"], column["text"] = json.dumps(parsed), ", ".join(labels)
+                else:
+                    column["value"], column["text"] = json.dumps(parsed), str(parsed)
+                return
+        raise GraphQLError(f"Column {column_id} not found")
+
+    def duplicate_item_field(self, arguments, selection):
+        original = self._get(arguments["item_id"])
+        duplicate = json.loads(json.dumps(original))
+        duplicate["id"] = str(next(self.ids))
+        self.items[duplicate["id"]] = duplicate
+        parent = self.items.get(original.get("parent_id"))
+        if parent is not None:
+            siblings = parent["subitem_ids"]
+            siblings.insert(siblings.index(original["id"]) + 1, duplicate["id"])
+        return {"id": duplicate["id"]}
+
+    def delete_item_field(self, arguments, selection):
+        item = self.items.pop(str(arguments["item_id"]), None)
+        if item is None:
+            raise GraphQLError(f"Item {arguments['item_id']} not found")
+        parent = self.items.get(item.get("parent_id"))
+        if parent is not None:
+            parent["subitem_ids"].remove(item["id"])
+        return {"id": item["id"]}
+
+    def me_field(self, arguments, selection):
+        return {"id": "1", "name": "Mock User", "email": "mock@example.com"}
+
+    def execute(self, query, variables):
+        """
+        Resolve every root field of a document against the board
+        """
+        data = {}
+        errors = []
+        with self.lock:
+            self.variables = variables
+            for alias, name, raw_arguments, selection in root_fields(query):
+                if name == "complexity":
+                    data[alias] = None
+                    continue
+                resolver = getattr(self, f"{name}_field", None)
+                try:
+                    if resolver is None:
+                        raise GraphQLError(f"Field '{name}' is not supported by the mock server")
+                    data[alias] = resolver(parse_arguments(raw_arguments, variables), selection)
+                except GraphQLError as e:
+                    data[alias] = None
+                    errors.append({"message": str(e), "path": [alias]})
+        return data, errors
+
+
+class MockMondayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.stats_lock:
+            self.server.connections += 1
+        if self.server.connect_latency:
+            time.sleep(self.server.connect_latency)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        with self.server.stats_lock:
+            self.server.requests += 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        status = 200
+        if self.server.error_rate and self.server.random.random() < self.server.error_rate:
+            with self.server.stats_lock:
+                self.server.injected_errors += 1
+            status, response = 500, {"error_message": "Injected failure", "status_code": 500}
+        else:
+            response = self.server.respond(payload)
+
+        body = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockMondayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, board=None, latency=0.0, error_rate=0.0, seed=0, connect_latency=0.0):
+        super().__init__((host, port), MockMondayHandler)
+        self.board = board
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.stats_lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.injected_errors = 0
+        self.mutations = []
+        self.complexity = COMPLEXITY_BUDGET
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    def respond(self, payload):
+        """Build the GraphQL response for a request payload"""
+        query = payload.get("query", "")
+        if self.board is None:
+            return {"data": {"me": {"id": "1", "name": "Mock User", "email": "mock@example.com"}}}
+
+        variables = payload.get("variables") or {}
+        data, errors = self.board.execute(query, variables)
+
+        fields = [field for field in root_fields(query) if field[1] != "complexity"]
+        if query.lstrip().startswith("mutation"):
+            with self.stats_lock:
+                for alias, name, raw_arguments, _ in fields:
+                    self.mutations.append({"field": name, "arguments": parse_arguments(raw_arguments, variables)})
+
+        if "complexity" in data:
+            cost = FIELD_COMPLEXITY * len(fields)
+            data["complexity"] = {"before": self.complexity, "after": self.complexity - cost,
+                                  "reset_in_x_seconds": 60}
+
+        response = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return response
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.connections = 0
+            self.requests = 0
+            self.injected_errors = 0
+            self.mutations = []
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
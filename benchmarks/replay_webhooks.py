@@ -0,0 +1,130 @@
+"""
+Benchmark: fire recorded /distribuir webhooks again at N times their rate
+
+Reads the webhook deliveries of a cassette recorded with
+MONDAY_CASSETTE_MODE=record and sends them again with their original
+spacing divided by --speed (idle gaps longer than --max-gap are shortened
+first). By default the app is started in-process in replay mode on the
+same cassette, so nothing reaches Monday.com; --url targets a build that is
+already running (start it with MONDAY_CASSETTE_MODE=replay).
+
+Reports throughput, p50/p95/p99 latency, status codes and how far the
+driver fell behind schedule, so runs of different builds can be compared.
+
+Run from the repository root:
+    python -m benchmarks.replay_webhooks instance/monday_cassette.jsonl.gz --speed 10
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.bench_distribuir import percentile
+
+
+def load_webhooks(path, max_gap):
+    """(offset_seconds, path, query_string, payload) for every recorded webhook"""
+    from cassette import read_cassette
+
+    webhooks = []
+    offset = 0.0
+    previous = None
+    for entry in read_cassette(path):
+        if entry.get("kind") != "webhook":
+            continue
+        if previous is not None:
+            offset += min(max(0.0, entry["t"] - previous), max_gap)
+        previous = entry["t"]
+        webhooks.append((offset, entry["path"], entry.get("query_string") or "", entry["payload"]))
+    return webhooks
+
+
+def start_app(path, latency_scale):
+    """Serve the app in replay mode on an ephemeral port; returns (base_url, replayer)"""
+    from werkzeug.serving import make_server
+
+    directory = tempfile.mkdtemp()
+    # The app reads its configuration at import time
+    os.environ["MONDAY_CASSETTE_MODE"] = "replay"
+    os.environ["MONDAY_CASSETTE_PATH"] = path
+    os.environ["MONDAY_CASSETTE_LATENCY_SCALE"] = str(latency_scale)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{directory}/operations.db")
+    os.environ.setdefault("MUTATION_JOURNAL_PATH", f"{directory}/mutation_journal.db")
+    os.environ.setdefault("MUTATION_JOURNAL_RESUME_ON_STARTUP", "0")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import index
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, index.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="replay-app", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", index.monday_cassette
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassette")
+    parser.add_argument("--speed", type=float, default=1.0, help="multiple of the recorded webhook rate")
+    parser.add_argument("--max-gap", type=float, default=5.0, help="longest idle gap kept between webhooks (seconds)")
+    parser.add_argument("--url", help="base URL of a running build (default: start the app in-process)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="in-process only: scale recorded API latencies")
+    parser.add_argument("--concurrency", type=int, default=32, help="webhooks in flight at once")
+    args = parser.parse_args()
+
+    # The in-process app must be configured before the cassette module is first imported
+    replayer = None
+    base_url = args.url
+    if base_url is None:
+        base_url, replayer = start_app(args.cassette, args.latency_scale)
+
+    webhooks = load_webhooks(args.cassette, args.max_gap)
+    if not webhooks:
+        sys.exit(f"No webhooks recorded in {args.cassette}")
+
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency))
+    lock = threading.Lock()
+    latencies = []
+    lateness = []
+    statuses = {}
+
+    def fire(due, path, query_string, payload):
+        sent = time.perf_counter()
+        url = f"{base_url.rstrip('/')}{path}" + (f"?{query_string}" if query_string else "")
+        try:
+            status = session.post(url, json=payload, timeout=120).status_code
+        except requests.exceptions.RequestException as e:
+            status = type(e).__name__
+        with lock:
+            latencies.append(time.perf_counter() - sent)
+            lateness.append(sent - due)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    span = webhooks[-1][0] / args.speed
+    print(f"Replaying {len(webhooks)} webhooks over {span:.1f}s ({args.speed}x) against {base_url}")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for offset, path, query_string, payload in webhooks:
+            due = start + offset / args.speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(fire, due, path, query_string, payload)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(webhooks) / elapsed:8.2f} webhooks/s (scheduled {len(webhooks) / max(span, 1e-9):.2f}/s), "
+          f"p50 {percentile(latencies, 0.5) * 1000:.1f} ms, p95 {percentile(latencies, 0.95) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms, max lag {max(lateness) * 1000:.1f} ms, "
+          f"statuses {statuses}")
+    if replayer is not None:
+        print(f"Replayed API responses: {replayer.stats}")
+
+
+if __name__ == "__main__":
+    main()
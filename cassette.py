@@ -0,0 +1,242 @@
+"""
+Record and replay Monday.com traffic
+
+In record mode every Monday.com request/response pair and every incoming
+/distribuir payload is appended to a gzip-compressed JSON lines cassette.
+The API token is never written. In replay mode the API is never contacted:
+responses are served from the cassette after the recorded latency (scaled
+by MONDAY_CASSETTE_LATENCY_SCALE), so recorded webhooks can be fired again
+with benchmarks/replay_webhooks.py to reproduce production load offline.
+
+    MONDAY_CASSETTE_MODE=record flask --app index run    # capture traffic
+    MONDAY_CASSETTE_MODE=replay flask --app index run    # serve it back
+"""
+import io
+import os
+import gzip
+import json
+import time
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+import json_codec
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# "record", "replay" or empty (talk to Monday.com normally)
+MONDAY_CASSETTE_MODE = os.environ.get("MONDAY_CASSETTE_MODE", "").lower()
+MONDAY_CASSETTE_PATH = os.environ.get("MONDAY_CASSETTE_PATH", "instance/monday_cassette.jsonl.gz")
+MONDAY_CASSETTE_LATENCY_SCALE = float(os.environ.get("MONDAY_CASSETTE_LATENCY_SCALE", "1.0"))
+
+REDACTED = "[REDACTED]"
+
+
+def request_key(query, variables):
+    """Canonical form of a GraphQL request, used to match replayed requests"""
+    return json.dumps({"query": query, "variables": variables or {}}, sort_keys=True)
+
+
+def read_cassette(path):
+    """
+    Every entry of a cassette, in recording order
+    A cassette whose recorder was killed is read up to its last complete entry
+    """
+    entries = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entries.append(json.loads(line))
+    except (EOFError, ValueError) as e:
+        logger.warning("Cassette %s ends early (%s); using its %s complete entries", path, e, len(entries))
+    return entries
+
+
+def _raw_response(status, body, content_type="application/json", retry_after=None):
+    headers = {"Content-Type": content_type, "Content-Length": str(len(body))}
+    if retry_after is not None:
+        headers["Retry-After"] = str(retry_after)
+    return HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, preload_content=False)
+
+
+class CassetteRecorder:
+    """
+    Appends API exchanges and webhook payloads to a cassette
+
+    Every entry is flushed as it is written, so a killed process loses at
+    most the entry in progress. `secrets` are replaced in everything written.
+    """
+
+    def __init__(self, path=MONDAY_CASSETTE_PATH, secrets=()):
+        self.path = path
+        self.secrets = [secret for secret in secrets if secret]
+
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self.entries = 0
+        atexit.register(self.close)
+        self._write({"kind": "session", "started_at": datetime.now().isoformat()})
+
+    def _write(self, entry):
+        entry["t"] = time.time()
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        for secret in self.secrets:
+            line = line.replace(secret, REDACTED)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.entries += 1
+
+    def record_exchange(self, request_body, status, content, headers, latency):
+        """Record one Monday.com request and its response"""
+        request = json_codec.loads(request_body) if request_body else {}
+        try:
+            body = {"json": json_codec.loads(content)}
+        except ValueError:
+            body = {"text": content.decode("utf-8", "replace")}
+        self._write({
+            "kind": "api",
+            "request": {"query": request.get("query"), "variables": request.get("variables") or {}},
+            "status": status,
+            "retry_after": headers.get("Retry-After"),
+            "latency": round(latency, 6),
+            **body
+        })
+
+    def record_webhook(self, path, query_string, payload):
+        """Record an incoming webhook delivery"""
+        self._write({"kind": "webhook", "path": path, "query_string": query_string, "payload": payload})
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that sends requests normally and records each exchange"""
+
+    def __init__(self, recorder, **kwargs):
+        super().__init__(**kwargs)
+        self.recorder = recorder
+
+    def send(self, request, stream=False, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, stream=True, **kwargs)
+        content = response.content
+        latency = time.perf_counter() - start
+        self.recorder.record_exchange(request.body, response.status_code, content, response.headers, latency)
+        # The body has been read (and decompressed); give streaming callers a fresh raw stream of it
+        response.raw = _raw_response(response.status_code, content, response.headers.get("Content-Type", ""),
+                                     response.headers.get("Retry-After"))
+        return response
+
+
+class CassetteReplayer:
+    """
+    Serves recorded responses for Monday.com requests
+
+    Requests are matched on their exact query and variables first, then on
+    their root field (so a build that shapes queries differently still gets
+    a plausible response). Repeated requests cycle through the recorded
+    responses for their key. Unmatched requests get a GraphQL error.
+    """
+
+    def __init__(self, path=MONDAY_CASSETTE_PATH, latency_scale=MONDAY_CASSETTE_LATENCY_SCALE):
+        self.path = path
+        self.latency_scale = latency_scale
+
+        self._lock = threading.Lock()
+        self._exact = defaultdict(list)
+        self._by_operation = defaultdict(list)
+        self._cursors = defaultdict(int)
+        self.stats = {"exact": 0, "operation": 0, "missed": 0}
+
+        for entry in read_cassette(path):
+            if entry.get("kind") != "api":
+                continue
+            query = entry["request"].get("query") or ""
+            self._exact[request_key(query, entry["request"].get("variables"))].append(entry)
+            self._by_operation[metrics.operation_name(query)].append(entry)
+        logger.info("Replaying %s recorded Monday.com responses from %s",
+                    sum(len(entries) for entries in self._exact.values()), path)
+
+    def _next(self, table, key):
+        entries = table.get(key)
+        if not entries:
+            return None
+        cursor = self._cursors[(id(table), key)]
+        self._cursors[(id(table), key)] = cursor + 1
+        return entries[cursor % len(entries)]
+
+    def lookup(self, body):
+        """Recorded entry for a request body, or None"""
+        payload = json_codec.loads(body) if body else {}
+        query = payload.get("query") or ""
+        operation = metrics.operation_name(query)
+        with self._lock:
+            entry = self._next(self._exact, request_key(query, payload.get("variables")))
+            if entry is not None:
+                self.stats["exact"] += 1
+                return entry
+            entry = self._next(self._by_operation, operation)
+            if entry is not None:
+                self.stats["operation"] += 1
+                return entry
+            self.stats["missed"] += 1
+        logger.warning("No recorded response for %s", operation)
+        return None
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter that answers from a cassette instead of the network"""
+
+    def __init__(self, replayer, **kwargs):
+        super().__init__(**kwargs)
+        self.replayer = replayer
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        entry = self.replayer.lookup(request.body)
+        if entry is None:
+            body = json_codec.dumps({"data": None, "errors": [{"message": "No recorded response for this request"}]})
+            return self.build_response(request, _raw_response(200, body))
+
+        time.sleep(entry["latency"] * self.replayer.latency_scale)
+        if "json" in entry:
+            body, content_type = json_codec.dumps(entry["json"]), "application/json"
+        else:
+            body, content_type = entry.get("text", "").encode("utf-8"), "text/plain"
+        return self.build_response(request, _raw_response(entry["status"], body, content_type, entry.get("retry_after")))
+
+
+def install(session, api_url, mode=MONDAY_CASSETTE_MODE, path=MONDAY_CASSETTE_PATH, secrets=(), **adapter_options):
+    """
+    Route a session's requests to api_url through the cassette
+    `adapter_options` (e.g. pool_maxsize) are passed to the transport adapter.
+    Returns the recorder or replayer, or None when cassettes are off
+    """
+    if mode == "record":
+        recorder = CassetteRecorder(path, secrets)
+        session.mount(api_url, RecordingAdapter(recorder, **adapter_options))
+        logger.warning("Recording Monday.com traffic and webhooks to %s", path)
+        return recorder
+    if mode == "replay":
+        replayer = CassetteReplayer(path)
+        session.mount(api_url, ReplayAdapter(replayer, **adapter_options))
+        logger.warning("Replaying Monday.com traffic from %s - the API is not contacted", path)
+        return replayer
+    if mode:
+        logger.error("Unknown MONDAY_CASSETTE_MODE %r, ignoring it", mode)
+    return None
@@ -0,0 +1,113 @@
+"""
+Pre-filter for Monday.com webhook events
+
+Column-change events carry `columnId`, `value` and `previousValue`, which
+is often enough to tell that a delivery cannot change anything: an edit to
+a column the distribution never reads, a value set to what it already was,
+or a change that leaves the item without a currency or a value. Those are
+answered without any Monday.com API call or complexity budget.
+"""
+import os
+import logging
+
+from models import Item, VALUE_COLUMN, FORMULA_COLUMN, CURRENCY_COLUMN, LIMIT_COLUMN, parse_number
+
+logger = logging.getLogger(__name__)
+
+# Parent item columns whose changes can start a distribution (comma separated)
+DISTRIBUIR_TRIGGER_COLUMNS = frozenset(
+    column.strip() for column in os.environ.get(
+        "DISTRIBUIR_TRIGGER_COLUMNS", ",".join((VALUE_COLUMN, FORMULA_COLUMN, CURRENCY_COLUMN, LIMIT_COLUMN))
+    ).split(",") if column.strip()
+)
+
+# Metadata Monday adds to event values that does not change the value itself
+VOLATILE_KEYS = ("changed_at", "post_id")
+
+
+def _normalise(value):
+    if isinstance(value, dict):
+        return {key: _normalise(val) for key, val in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_normalise(val) for val in value]
+    return value
+
+
+def is_empty(value):
+    """True when an event value clears the column"""
+    if value is None or value == {} or value == "":
+        return True
+    if isinstance(value, dict):
+        if "chosenValues" in value:
+            return not value["chosenValues"]
+        if "label" in value:
+            return not (value["label"] or {}).get("text")
+        if "ids" in value:
+            return not value["ids"]
+        if "value" in value:
+            return value["value"] in (None, "")
+    return False
+
+
+def event_number(value):
+    """Numeric value of a numbers column event value (0 when cleared)"""
+    if isinstance(value, dict):
+        value = value.get("value")
+    if isinstance(value, (int, float)):
+        return float(value)
+    return parse_number(value)
+
+
+def skip_reason(event, trigger_columns=DISTRIBUIR_TRIGGER_COLUMNS):
+    """
+    Why a webhook event can be answered without processing, or None
+
+    Returns a (message, reason) pair: the message is what distribuir would
+    have answered after fetching the item, the reason a short metrics label.
+    Events without a columnId (item creation, manual calls) are never skipped.
+    """
+    column_id = event.get("columnId")
+    if not column_id:
+        return None
+    if column_id not in trigger_columns:
+        return f"Change to column {column_id} does not affect distribution", "irrelevant_column"
+
+    if "value" not in event or "previousValue" not in event:
+        return None
+    value = event["value"]
+    previous = event["previousValue"]
+    if column_id == VALUE_COLUMN:
+        if event_number(value) == event_number(previous):
+            return "Value unchanged", "unchanged"
+        if event_number(value) <= 0:
+            return "No value to distribute", "no_value"
+    elif _normalise(value) == _normalise(previous):
+        return "Value unchanged", "unchanged"
+
+    if column_id == CURRENCY_COLUMN and is_empty(value):
+        return "No status value set, skipping processing", "no_currency"
+    return None
+
+
+def snapshot_from_payload(payload, item_columns, subitem_columns):
+    """
+    Item model built from a payload that carries the whole item, or None
+
+    The payload's `item` must include `column_values` covering `item_columns`
+    and a `subitems` list whose entries cover `subitem_columns`; column-change
+    events only carry one column, so they never qualify.
+    """
+    data = payload.get("item")
+    if not isinstance(data, dict) or not data.get("id") or not isinstance(data.get("subitems"), list):
+        return None
+    try:
+        present = {col["id"] for col in data.get("column_values") or []}
+        if not present.issuperset(item_columns):
+            return None
+        for subitem in data["subitems"]:
+            if not subitem.get("id") or not {col["id"] for col in subitem.get("column_values") or []}.issuperset(subitem_columns):
+                return None
+    except (KeyError, TypeError, AttributeError):
+        return None
+    logger.debug("Using the item snapshot from the payload for item %s", data["id"])
+    return Item.from_api(data, name=data.get("name", ""), include_subitems=True)
@@ -0,0 +1,176 @@
+import os
+import logging
+import requests
+
+from async_client import load_asyncio
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of aliased mutations sent in one GraphQL document.
+# Keeps each request well under Monday.com's per-query complexity limit.
+MONDAY_BATCH_SIZE = int(os.environ.get("MONDAY_BATCH_SIZE", "25"))
+
+
+class MutationBatch:
+    """
+    Collect Monday.com mutations and send them as aliased GraphQL documents
+
+    Each queued mutation gets an alias (u1, u2, ...) and its own set of
+    variables, so a whole distribution pass goes out as one request per
+    chunk instead of one request per subitem. Results and errors are mapped
+    back to the alias returned by the add methods.
+    """
+
+    def __init__(self, send, chunk_size=MONDAY_BATCH_SIZE):
+        self.send = send
+        self.chunk_size = max(1, chunk_size)
+        self.mutations = []
+        self.results = {}
+
+    def __len__(self):
+        return len(self.mutations)
+
+    def add(self, field, arguments, selection="id"):
+        """
+        Queue a mutation field call
+
+        `arguments` is a list of (argument_name, graphql_type, value) tuples.
+        Returns the alias that identifies this mutation in the results.
+        """
+        alias = f"u{len(self.results) + len(self.mutations) + 1}"
+        self.mutations.append({
+            "alias": alias,
+            "field": field,
+            "arguments": arguments,
+            "selection": selection
+        })
+        return alias
+
+    def change_column_value(self, board_id, item_id, column_id, value):
+        """Queue a change_column_value mutation"""
+        return self.add("change_column_value", [
+            ("board_id", "ID!", str(board_id)),
+            ("item_id", "ID!", str(item_id)),
+            ("column_id", "String!", column_id),
+            ("value", "JSON!", str(value))
+        ])
+
+    def change_simple_column_value(self, board_id, item_id, column_id, value):
+        """Queue a change_simple_column_value mutation"""
+        return self.add("change_simple_column_value", [
+            ("board_id", "ID!", str(board_id)),
+            ("item_id", "ID!", str(item_id)),
+            ("column_id", "String!", column_id),
+            ("value", "String!", str(value))
+        ])
+
+    def duplicate_item(self, board_id, item_id):
+        """Queue a duplicate_item mutation (the copy keeps every column, file and update)"""
+        return self.add("duplicate_item", [
+            ("board_id", "ID!", str(board_id)),
+            ("item_id", "ID!", str(item_id))
+        ])
+
+    def delete_item(self, item_id):
+        """Queue a delete_item mutation"""
+        return self.add("delete_item", [("item_id", "ID!", str(item_id))])
+
+    @staticmethod
+    def build_document(mutations):
+        """
+        Build one aliased mutation document and its variables
+        """
+        definitions = []
+        fields = []
+        variables = {}
+
+        for mutation in mutations:
+            alias = mutation["alias"]
+            call_arguments = []
+            for name, graphql_type, value in mutation["arguments"]:
+                variable = f"{alias}_{name}"
+                definitions.append(f"${variable}: {graphql_type}")
+                call_arguments.append(f"{name}: ${variable}")
+                variables[variable] = value
+            fields.append(f"{alias}: {mutation['field']}({', '.join(call_arguments)}) {{ {mutation['selection']} }}")
+
+        query = f"mutation({', '.join(definitions)}) {{\n    " + "\n    ".join(fields) + "\n}"
+        return query, variables
+
+    def _chunks(self):
+        pending, self.mutations = self.mutations, []
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = pending[start:start + self.chunk_size]
+            query, variables = self.build_document(chunk)
+            logger.info("Sending batch of %s mutations (%s..%s)", len(chunk), chunk[0]['alias'], chunk[-1]['alias'])
+            yield chunk, query, variables
+
+    def _record(self, chunk, response):
+        """Map a chunk's response (or RequestException) back to its aliases"""
+        if isinstance(response, requests.exceptions.RequestException):
+            logger.error("Mutation batch failed: %s", response)
+            for mutation in chunk:
+                self.results[mutation["alias"]] = {"data": None, "error": str(response)}
+            return
+
+        data = response.get("data") or {}
+        aliases = {mutation["alias"] for mutation in chunk}
+        alias_errors = {}
+        general_errors = []
+        for error in response.get("errors", []) or []:
+            path = error.get("path") or []
+            if path and path[0] in aliases:
+                alias_errors[path[0]] = error.get("message", "Unknown error")
+            else:
+                general_errors.append(error.get("message", "Unknown error"))
+        if response.get("error_message"):
+            general_errors.append(response["error_message"])
+
+        for mutation in chunk:
+            alias = mutation["alias"]
+            result = data.get(alias)
+            error = alias_errors.get(alias)
+            if error is None and result is None:
+                error = "; ".join(general_errors) or "No result returned"
+            self.results[alias] = {"data": result, "error": error}
+
+    def execute(self):
+        """
+        Send every queued mutation, chunked by `chunk_size`
+
+        Returns a dict mapping each alias to {"data": ..., "error": ...}.
+        """
+        for chunk, query, variables in self._chunks():
+            try:
+                response = self.send(query, variables)
+            except requests.exceptions.RequestException as e:
+                response = e
+            self._record(chunk, response)
+
+        return self.results
+
+    async def execute_async(self, send):
+        """
+        Send every queued mutation with the coroutine function `send`
+
+        The chunks are independent of each other, so they are all sent at
+        once (the client bounds how many are in flight). Returns the same
+        alias mapping as execute.
+        """
+        async def send_chunk(chunk, query, variables):
+            try:
+                response = await send(query, variables)
+            except requests.exceptions.RequestException as e:
+                response = e
+            self._record(chunk, response)
+
+        await load_asyncio().gather(*(send_chunk(*chunk) for chunk in list(self._chunks())))
+        return self.results
+
+    def error_for(self, aliases):
+        """
+        Return the combined error message for a group of aliases, or None
+        """
+        errors = [self.results[alias]["error"] for alias in aliases
+                  if alias in self.results and self.results[alias]["error"]]
+        return "; ".join(errors) if errors else None
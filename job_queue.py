@@ -0,0 +1,148 @@
+import os
+import time
+import uuid
+import logging
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Background processing configuration for /distribuir
+DISTRIBUIR_ASYNC = os.environ.get("DISTRIBUIR_ASYNC", "false").lower() in ("1", "true", "yes")
+DISTRIBUIR_WORKERS = int(os.environ.get("DISTRIBUIR_WORKERS", "4"))
+DISTRIBUIR_QUEUE_SIZE = int(os.environ.get("DISTRIBUIR_QUEUE_SIZE", "100"))
+DISTRIBUIR_JOB_HISTORY = int(os.environ.get("DISTRIBUIR_JOB_HISTORY", "50"))
+
+
+class QueueFull(Exception):
+    """Raised when the job queue has no room for another job"""
+
+
+class DistributionWorkerPool:
+    """
+    Bounded in-process job queue drained by a thread pool
+
+    Jobs for the same item id never run concurrently: a job submitted while
+    another one for that item is queued or running waits behind it and is
+    handed to the pool when the earlier job finishes. A submission for an
+    item whose latest job has not started yet is merged into that job, and
+    jobs wait `coalesce_window` seconds before starting so bursts merge. The
+    wait is a timer, so no pool thread sits idle through it.
+    """
+
+    def __init__(self, handler, workers=DISTRIBUIR_WORKERS, max_queued=DISTRIBUIR_QUEUE_SIZE,
+                 history=DISTRIBUIR_JOB_HISTORY, coalesce_window=0):
+        self.handler = handler
+        self.workers = workers
+        self.max_queued = max_queued
+        self.coalesce_window = coalesce_window
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._chains = {}
+        self._latest = {}
+        self._outstanding = 0
+        self._running = 0
+        self.outcomes = deque(maxlen=history)
+        self.stats = {"accepted": 0, "rejected": 0, "coalesced": 0, "succeeded": 0, "failed": 0}
+
+    def _get_executor(self):
+        # Threads are created on first use so importing the app stays cheap
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="distribuir")
+        return self._executor
+
+    def submit(self, item_id, item_name):
+        """
+        Queue a distribution job and return its description
+        """
+        with self._lock:
+            latest = self._latest.get(str(item_id))
+            if latest is not None and latest["status"] == "queued":
+                self.stats["coalesced"] += 1
+                logger.info("Webhook for item %s merged into queued job %s", item_id, latest['id'])
+                return latest
+
+            if self._outstanding >= self.max_queued:
+                self.stats["rejected"] += 1
+                raise QueueFull(f"Distribution queue is full ({self.max_queued} jobs)")
+
+            job = {
+                "id": uuid.uuid4().hex,
+                "item_id": str(item_id),
+                "item_name": item_name,
+                # Jobs run with the submitting request's context (e.g. its request id for logging)
+                "context": contextvars.copy_context(),
+                "status": "queued",
+                "queued_at": datetime.now().isoformat(),
+                "not_before": time.monotonic() + self.coalesce_window
+            }
+            self._outstanding += 1
+            self._latest[job["item_id"]] = job
+            self.stats["accepted"] += 1
+
+            chain = self._chains.get(job["item_id"])
+            if chain is None:
+                self._chains[job["item_id"]] = deque()
+                self._schedule(job)
+            else:
+                chain.append(job)
+                logger.info("Job %s for item %s waits behind %s earlier job(s)", job['id'], item_id, len(chain))
+
+        return job
+
+    def _schedule(self, job):
+        """Hand a job to the pool once its coalescing wait is over"""
+        delay = job.pop("not_before") - time.monotonic()
+        if delay > 0:
+            timer = threading.Timer(delay, self._get_executor().submit, (self._run, job))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._get_executor().submit(self._run, job)
+
+    def _run(self, job):
+        with self._lock:
+            self._running += 1
+            job["status"] = "running"
+        job["started_at"] = datetime.now().isoformat()
+
+        try:
+            result, status_code = job["context"].run(self.handler, job["item_id"], job["item_name"])
+            job["status_code"] = status_code
+            job["status"] = "succeeded" if status_code < 400 else "failed"
+            job["result"] = result.get("message") or result.get("error")
+        except Exception as e:
+            logger.error("Distribution job %s for item %s failed: %s", job['id'], job['item_id'], e)
+            job["status"] = "failed"
+            job["result"] = str(e)
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+            with self._lock:
+                self._running -= 1
+                self._outstanding -= 1
+                self.stats[job["status"]] += 1
+                del job["context"]
+                self.outcomes.appendleft(job)
+
+                chain = self._chains[job["item_id"]]
+                if chain:
+                    self._schedule(chain.popleft())
+                else:
+                    del self._chains[job["item_id"]]
+                    del self._latest[job["item_id"]]
+
+    def snapshot(self):
+        """Queue depth, counters and recent job outcomes for /status"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queued": self.max_queued,
+                "queue_depth": self._outstanding - self._running,
+                "running": self._running,
+                **self.stats,
+                "recent_jobs": list(self.outcomes)
+            }
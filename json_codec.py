@@ -0,0 +1,99 @@
+"""
+JSON encoding and decoding for Monday.com traffic
+
+Bodies are decoded once, straight from bytes, with orjson when it is
+installed and the standard library otherwise. Board scans can be parsed
+incrementally with ijson (when installed), so a page of items is handed to
+the caller one item at a time instead of as a whole decoded document.
+
+Both backends are optional: install them with the "fast" extra
+(pip install ".[fast]" or uv sync --extra fast).
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # optional fast backend
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional streaming backend
+    ijson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+STREAMING_BACKEND = "ijson" if ijson is not None else None
+
+
+def loads(data):
+    """Decode a JSON document from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """Encode obj as compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _walk(document, path):
+    for key in path.split("."):
+        if key == "item" and isinstance(document, list):
+            document = document[0] if document else None
+        elif isinstance(document, dict):
+            document = document.get(key)
+        else:
+            return None
+    return document
+
+
+def iter_page(stream, page_path):
+    """
+    Incrementally parse a paginated response
+
+    `page_path` is the ijson-style dotted path of the page object, where
+    "item" enters a list (e.g. "data.boards.item.items_page"). Yields
+    ("item", item) for every element of the page's "items" list as soon as
+    it is parsed, ("cursor", cursor) for the page cursor, ("complexity",
+    complexity) for the root complexity block and ("errors", errors) when
+    the response carries GraphQL errors.
+
+    Without ijson the whole body is parsed at once and the same events are
+    produced from the decoded document.
+    """
+    if ijson is None:
+        document = loads(stream.read())
+        page = _walk(document, page_path) or {}
+        if "cursor" in page:
+            yield "cursor", page["cursor"]
+        for item in page.get("items") or []:
+            yield "item", item
+        complexity = _walk(document, "data.complexity")
+        if complexity is not None:
+            yield "complexity", complexity
+        if document.get("errors"):
+            yield "errors", document["errors"]
+        return
+
+    items_prefix = f"{page_path}.items.item"
+    cursor_prefix = f"{page_path}.cursor"
+    builders = {items_prefix: "item", "data.complexity": "complexity", "errors": "errors"}
+
+    builder = None
+    builder_prefix = None
+    for event_prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event_prefix == builder_prefix and event in ("end_map", "end_array"):
+                yield builders[builder_prefix], builder.value
+                builder = None
+            continue
+        if event_prefix == cursor_prefix and event in ("string", "null"):
+            yield "cursor", value
+        elif event_prefix in builders and event in ("start_map", "start_array"):
+            builder = ijson.ObjectBuilder()
+            builder_prefix = event_prefix
+            builder.event(event, value)
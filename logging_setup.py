@@ -0,0 +1,129 @@
+"""
+Logging configuration for the webhook service
+
+Records are handed to a background QueueListener so log I/O never blocks a
+request thread, every record carries the current request id, and large
+payloads are only serialised (and truncated or sampled) when a record is
+actually emitted.
+"""
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import contextvars
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")  # "text" or "json"
+LOG_MAX_BODY = int(os.environ.get("LOG_MAX_BODY", "2000"))
+LOG_BODY_SAMPLE_RATE = float(os.environ.get("LOG_BODY_SAMPLE_RATE", "1.0"))
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+
+request_id_var = contextvars.ContextVar("request_id", default="-")
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener = None
+
+
+def truncate(text, max_length=LOG_MAX_BODY):
+    """Cut long text down to max_length characters, noting the original size"""
+    if max_length and len(text) > max_length:
+        return f"{text[:max_length]}... [truncated, {len(text)} chars]"
+    return text
+
+
+class lazy:
+    """
+    Log argument that is only built when the record is formatted
+
+    Large bodies are truncated to LOG_MAX_BODY characters and sampled at
+    LOG_BODY_SAMPLE_RATE, so disabled or dropped records cost nothing.
+    """
+
+    __slots__ = ("func", "max_length")
+
+    def __init__(self, func, max_length=LOG_MAX_BODY):
+        self.func = func
+        self.max_length = max_length
+
+    def __str__(self):
+        if LOG_BODY_SAMPLE_RATE < 1 and random.random() >= LOG_BODY_SAMPLE_RATE:
+            return "[body not sampled]"
+        return truncate(str(self.func()), self.max_length)
+
+
+def lazy_json(obj, max_length=LOG_MAX_BODY):
+    """Compact JSON rendering of obj, deferred until the record is emitted"""
+    return lazy(lambda: json.dumps(obj, ensure_ascii=False, default=str), max_length)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the request id of the thread that logged them"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any `extra` fields"""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+
+def configure_logging(level=LOG_LEVEL, log_format=LOG_FORMAT):
+    """
+    Route all logging through a queue drained by a background listener
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    if log_format == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(formatter)
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level)
+
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,144 @@
+"""
+Minimal Prometheus-style metrics
+
+Counters and histograms with labels, rendered in the Prometheus text
+exposition format by /metrics. Values are kept per process, so each
+gunicorn worker reports its own series.
+"""
+import re
+import time
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_ROOT_FIELD = re.compile(r"\{\s*(?:complexity\s*\{[^}]*\}\s*)?(?:\w+\s*:\s*)?(\w+)")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=256)
+def operation_name(query):
+    """
+    Name of the root field of a GraphQL document (e.g. items, change_column_value)
+    """
+    match = _ROOT_FIELD.search(query)
+    return match.group(1) if match else "unknown"
+
+
+registry = Registry()
+
+api_requests = registry.register(Counter(
+    "monday_api_requests_total", "Monday.com API requests", ("operation", "status")))
+api_latency = registry.register(Histogram(
+    "monday_api_request_seconds", "Monday.com API request latency", ("operation",)))
+api_bytes_sent = registry.register(Counter(
+    "monday_api_sent_bytes_total", "Bytes sent to the Monday.com API", ("operation",)))
+api_bytes_received = registry.register(Counter(
+    "monday_api_received_bytes_total", "Bytes received from the Monday.com API", ("operation",)))
+
+distribution_phase = registry.register(Histogram(
+    "distribution_phase_seconds", "Time spent in each distribution phase", ("phase",)))
+subitems_processed = registry.register(Counter(
+    "distribution_subitems_processed_total", "Subitems successfully processed", ()))
+splits_created = registry.register(Counter(
+    "distribution_splits_total", "Subitems split into Parte 1 / Parte 2", ()))
+webhooks = registry.register(Counter(
+    "distribuir_webhooks_total", "Webhook deliveries handled by /distribuir", ("status",)))
+webhooks_filtered = registry.register(Counter(
+    "distribuir_webhooks_filtered_total", "Webhook deliveries answered from the event payload alone", ("reason",)))
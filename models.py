@@ -0,0 +1,111 @@
+"""
+Compact models for Monday.com items and subitems
+
+Column values are indexed by id once, when a model is built from the API
+object, so every lookup during a distribution is a single dict access
+instead of a scan of the column list.
+"""
+from dataclasses import dataclass, field
+
+# Parent item columns read during distribution
+VALUE_COLUMN = "numeric_mks63qc1"
+FORMULA_COLUMN = "numeric_mks64nh2"
+CURRENCY_COLUMN = "color_mks7xywc"
+LIMIT_COLUMN = "numeric_mks61nvq"
+
+
+def parse_number(raw_value):
+    """
+    Parse a Monday.com numeric column value (returned as a quoted string)
+    """
+    try:
+        value_str = raw_value or "0"
+        if isinstance(value_str, str):
+            value_str = value_str.strip('"') or "0"
+        return float(value_str)
+    except (ValueError, TypeError):
+        return 0
+
+
+@dataclass(slots=True)
+class Columns:
+    """Column values of an item, keyed by column id"""
+
+    columns: dict = field(default_factory=dict, repr=False)
+
+    @staticmethod
+    def index(column_values):
+        """{id: column} for a Monday.com column_values list"""
+        return {col["id"]: col for col in column_values or []}
+
+    def column(self, column_id):
+        """Raw column value dict, or None when the column was not fetched"""
+        return self.columns.get(column_id)
+
+    def value(self, column_id, default=None):
+        """Raw JSON `value` string of a column"""
+        col = self.columns.get(column_id)
+        return col.get("value") if col is not None else default
+
+    def text(self, column_id, default=None):
+        """Display text of a column"""
+        col = self.columns.get(column_id)
+        return col.get("text", "") if col is not None else default
+
+    def number(self, column_id):
+        """Numeric value of a column (0 when empty or missing)"""
+        col = self.columns.get(column_id)
+        return parse_number(col.get("value") if col is not None else None)
+
+
+@dataclass(slots=True)
+class Subitem(Columns):
+    id: str = ""
+    name: str = ""
+    board_id: str = None
+    parent_id: str = None
+
+    @classmethod
+    def from_api(cls, data, parent_id=None):
+        """Build a subitem from a Monday.com API object"""
+        board = data.get("board")
+        return cls(cls.index(data.get("column_values")), str(data["id"]), data.get("name", ""),
+                   board.get("id") if board else None, parent_id)
+
+
+@dataclass(slots=True)
+class Item(Columns):
+    id: str = ""
+    name: str = ""
+    subitems: list = None
+
+    @classmethod
+    def from_api(cls, data, name=None, include_subitems=False):
+        """
+        Build an item from a Monday.com API object
+        With include_subitems its `subitems` are wrapped as Subitem models
+        """
+        item = cls(columns=cls.index(data.get("column_values")), id=str(data["id"]),
+                   name=name if name is not None else data.get("name", ""))
+        if include_subitems:
+            item.subitems = [Subitem.from_api(subitem, item.id) for subitem in data.get("subitems") or []]
+        return item
+
+    @property
+    def numeric_value(self):
+        """Value assigned to every processed subitem"""
+        return self.number(VALUE_COLUMN)
+
+    @property
+    def formula_value(self):
+        return self.number(FORMULA_COLUMN)
+
+    @property
+    def currency(self):
+        """Raw currency dropdown value (e.g. '{"ids":[1]}'), empty when unset"""
+        return self.value(CURRENCY_COLUMN) or ""
+
+    @property
+    def limit_value(self):
+        """Total to distribute across the subitems"""
+        return self.number(LIMIT_COLUMN)
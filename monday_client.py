@@ -0,0 +1,53 @@
+import os
+import requests
+from requests.adapters import HTTPAdapter
+import json_codec
+
+# Connection pool configuration (override through environment variables)
+MONDAY_POOL_SIZE = int(os.environ.get("MONDAY_POOL_SIZE", "10"))
+MONDAY_CONNECT_TIMEOUT = float(os.environ.get("MONDAY_CONNECT_TIMEOUT", "5"))
+MONDAY_READ_TIMEOUT = float(os.environ.get("MONDAY_READ_TIMEOUT", "30"))
+
+
+class MondayClient:
+    """
+    Reusable Monday.com GraphQL client backed by a pooled keep-alive session
+
+    A single instance is shared by every API helper so consecutive calls reuse
+    the same TCP/TLS connection instead of paying a new handshake each time.
+    """
+
+    def __init__(self, api_token, api_url, pool_size=MONDAY_POOL_SIZE,
+                 connect_timeout=MONDAY_CONNECT_TIMEOUT, read_timeout=MONDAY_READ_TIMEOUT):
+        self.api_url = api_url
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_token}",
+            "Content-Type": "application/json",
+            "Connection": "keep-alive"
+        })
+
+    def post(self, payload, timeout=None, stream=False):
+        """
+        Send a GraphQL payload and return the raw response
+        With stream the body is left on the socket for incremental parsing
+        """
+        return self.session.post(self.api_url, data=json_codec.dumps(payload),
+                                 timeout=timeout or self.timeout, stream=stream)
+
+    def execute(self, query, variables=None, timeout=None):
+        """
+        Run a GraphQL document and return the decoded JSON body
+        """
+        response = self.post({"query": query, "variables": variables or {}}, timeout=timeout)
+        response.raise_for_status()
+        return json_codec.loads(response.content)
+
+    def close(self):
+        """Release every pooled connection"""
+        self.session.close()
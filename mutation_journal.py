@@ -0,0 +1,195 @@
+"""
+Write-ahead journal of distribution mutations
+
+Before a plan is applied it is stored, with the item id, in a local SQLite
+database; each applied step is recorded as it completes. If the process
+dies partway through, the next delivery for the item (or the startup
+resume pass) finishes only the unfinished steps from the stored plan
+instead of re-reading the board and re-running the distribution.
+
+Split steps are committed as soon as Monday.com confirms them, because
+repeating one would create duplicate parts. Column updates are idempotent,
+so their completions are written in one transaction per batch.
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+MUTATION_JOURNAL_PATH = os.environ.get("MUTATION_JOURNAL_PATH", "instance/mutation_journal.db")
+# A run holds its entry for this long after its last recorded step. An entry whose lease
+# has run out belongs to a run that died and may be resumed by any process.
+MUTATION_JOURNAL_LEASE = float(os.environ.get("MUTATION_JOURNAL_LEASE", "60"))
+# Plans older than this are not replayed (the board has likely changed since)
+MUTATION_JOURNAL_MAX_AGE = float(os.environ.get("MUTATION_JOURNAL_MAX_AGE", "86400"))
+# Resume entries left by a previous process in a background thread at startup
+MUTATION_JOURNAL_RESUME_ON_STARTUP = os.environ.get("MUTATION_JOURNAL_RESUME_ON_STARTUP", "1") == "1"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    item_id TEXT PRIMARY KEY,
+    plan TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    lease_until REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS journal_steps (
+    item_id TEXT NOT NULL,
+    op_index INTEGER NOT NULL,
+    step TEXT NOT NULL,
+    result TEXT,
+    PRIMARY KEY (item_id, op_index, step)
+);
+"""
+
+
+class JournalBusy(Exception):
+    """Raised when an item's journal entry is still leased by a run that may be alive"""
+
+
+class MutationJournal:
+    """
+    SQLite journal of in-flight distribution plans, one entry per item
+
+    The journal is best effort: if the database cannot be written the
+    error is logged and the distribution carries on without it.
+    """
+
+    def __init__(self, path=MUTATION_JOURNAL_PATH, lease=MUTATION_JOURNAL_LEASE, max_age=MUTATION_JOURNAL_MAX_AGE):
+        self.path = path
+        self.lease = lease
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._connection = None
+        self.stats = {"begun": 0, "finished": 0, "resumed": 0, "expired": 0, "errors": 0}
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            # WAL keeps committed steps safe when the process is killed, without a full fsync per commit
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _transaction(self, statements):
+        """Run (sql, parameters) pairs in one transaction; returns the last cursor or None on error"""
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor = None
+                    for sql, parameters in statements:
+                        if parameters and isinstance(parameters, list):
+                            cursor = connection.executemany(sql, parameters)
+                        else:
+                            cursor = connection.execute(sql, parameters or ())
+                    connection.execute("COMMIT")
+                    return cursor
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+            except (sqlite3.Error, OSError) as e:
+                self.stats["errors"] += 1
+                logger.error("Mutation journal %s unavailable: %s", self.path, e)
+                return None
+
+    def _query(self, sql, parameters=()):
+        with self._lock:
+            try:
+                return self._connect().execute(sql, parameters).fetchall()
+            except (sqlite3.Error, OSError) as e:
+                self.stats["errors"] += 1
+                logger.error("Mutation journal %s unavailable: %s", self.path, e)
+                return []
+
+    def begin(self, item_id, plan, lease=None):
+        """
+        Store a plan before any of it is applied (replacing an older entry for the item)
+        `lease` overrides the configured lease for a run that may take longer
+        """
+        now = time.time()
+        lease = lease or self.lease
+        self._transaction([
+            ("DELETE FROM journal_steps WHERE item_id = ?", (str(item_id),)),
+            ("INSERT OR REPLACE INTO journal (item_id, plan, created_at, lease_until) VALUES (?, ?, ?, ?)",
+             (str(item_id), json.dumps(plan), now, now + lease))
+        ])
+        self.stats["begun"] += 1
+
+    def record_steps(self, item_id, steps):
+        """
+        Record applied steps, given as (op_index, step, result) tuples, in one transaction
+        Also renews the run's lease (never shortening a longer one from begin or claim)
+        """
+        if not steps:
+            return
+        self._transaction([
+            ("INSERT OR REPLACE INTO journal_steps (item_id, op_index, step, result) VALUES (?, ?, ?, ?)",
+             [(str(item_id), op_index, step, json.dumps(result)) for op_index, step, result in steps]),
+            ("UPDATE journal SET lease_until = MAX(lease_until, ?) WHERE item_id = ?", (time.time() + self.lease, str(item_id)))
+        ])
+
+    def completed_steps(self, item_id):
+        """Steps already applied for an item, as {(op_index, step): result}"""
+        rows = self._query("SELECT op_index, step, result FROM journal_steps WHERE item_id = ?", (str(item_id),))
+        return {(op_index, step): json.loads(result) if result is not None else None
+                for op_index, step, result in rows}
+
+    def finish(self, item_id):
+        """Drop an item's entry once its plan has been applied"""
+        self._transaction([
+            ("DELETE FROM journal_steps WHERE item_id = ?", (str(item_id),)),
+            ("DELETE FROM journal WHERE item_id = ?", (str(item_id),))
+        ])
+        self.stats["finished"] += 1
+
+    def release(self, item_id):
+        """End a run's lease without finishing its entry, so the next delivery resumes it right away"""
+        self._transaction([("UPDATE journal SET lease_until = 0 WHERE item_id = ?", (str(item_id),))])
+
+    def claim(self, item_id, lease=None):
+        """
+        Take over an interrupted entry and return its plan
+        Returns None when there is no entry or it is too old to replay (it is
+        dropped then); raises JournalBusy while another run holds its lease.
+        `lease` overrides the configured lease as in begin()
+        """
+        item_id = str(item_id)
+        lease = lease or self.lease
+        rows = self._query("SELECT plan, created_at FROM journal WHERE item_id = ?", (item_id,))
+        if not rows:
+            return None
+        plan, created_at = rows[0]
+        now = time.time()
+        if now - created_at > self.max_age:
+            logger.warning("Dropping journal entry for item %s from %.0fs ago without replaying it", item_id, now - created_at)
+            self.finish(item_id)
+            self.stats["expired"] += 1
+            return None
+        cursor = self._transaction([
+            ("UPDATE journal SET lease_until = ? WHERE item_id = ? AND lease_until <= ?", (now + lease, item_id, now))
+        ])
+        if cursor is None:
+            return None
+        if cursor.rowcount != 1:
+            raise JournalBusy(f"Distribution of item {item_id} is still in progress elsewhere")
+        self.stats["resumed"] += 1
+        return json.loads(plan)
+
+    def pending(self):
+        """Item ids with an unfinished plan, with the time their lease ends"""
+        return self._query("SELECT item_id, lease_until FROM journal ORDER BY created_at")
+
+    def snapshot(self):
+        """Journal counters and pending entries for monitoring"""
+        return {"pending": len(self.pending()), **self.stats}
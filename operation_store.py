@@ -0,0 +1,236 @@
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+# Operation history storage - SQLite by default, Postgres through DATABASE_URL
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///operations.db")
+OPERATIONS_RETENTION_DAYS = int(os.environ.get("OPERATIONS_RETENTION_DAYS", "30"))
+OPERATIONS_MAX_ROWS = int(os.environ.get("OPERATIONS_MAX_ROWS", "100000"))
+OPERATIONS_BATCH_SIZE = int(os.environ.get("OPERATIONS_BATCH_SIZE", "50"))
+OPERATIONS_FLUSH_INTERVAL = float(os.environ.get("OPERATIONS_FLUSH_INTERVAL", "1.0"))
+OPERATIONS_QUEUE_SIZE = int(os.environ.get("OPERATIONS_QUEUE_SIZE", "1000"))
+OPERATIONS_PURGE_INTERVAL = 300
+
+# Flask-SQLAlchemy and the model are loaded on first use (see load_models):
+# importing SQLAlchemy takes longer than starting the rest of the app
+db = None
+Operation = None
+_models_lock = threading.Lock()
+
+
+def load_models():
+    """Import Flask-SQLAlchemy and define the Operation model, once"""
+    global db, Operation
+    with _models_lock:
+        if db is not None:
+            return
+        from flask_sqlalchemy import SQLAlchemy
+        from sqlalchemy.orm import DeclarativeBase
+
+        class Base(DeclarativeBase):
+            pass
+
+        database = SQLAlchemy(model_class=Base)
+
+        class OperationModel(database.Model):
+            __tablename__ = "operations"
+
+            id = database.Column(database.Integer, primary_key=True)
+            item_id = database.Column(database.String(64), nullable=False, index=True)
+            timestamp = database.Column(database.DateTime, nullable=False, default=datetime.now, index=True)
+            remaining_value = database.Column(database.Float, nullable=False, default=0)
+            processed_subitems = database.Column(database.Text, nullable=False, default="[]")
+
+            def to_dict(self):
+                return {
+                    "id": self.id,
+                    "item_id": self.item_id,
+                    "timestamp": self.timestamp.isoformat(),
+                    "remaining_value": self.remaining_value,
+                    "processed_subitems": json.loads(self.processed_subitems or "[]")
+                }
+
+        Operation = OperationModel
+        db = database
+
+
+def database_url():
+    """DATABASE_URL normalised for SQLAlchemy (Heroku-style postgres:// URLs)"""
+    if DATABASE_URL.startswith("postgres://"):
+        return DATABASE_URL.replace("postgres://", "postgresql://", 1)
+    return DATABASE_URL
+
+
+class OperationStore:
+    """
+    Persistent, indexed history of distribution operations
+
+    Writes are queued and flushed in batches by a background thread, so the
+    request path never waits on the database. Rows older than the retention
+    period, or beyond the maximum row count, are purged periodically.
+    """
+
+    def __init__(self, batch_size=OPERATIONS_BATCH_SIZE, flush_interval=OPERATIONS_FLUSH_INTERVAL,
+                 retention_days=OPERATIONS_RETENTION_DAYS, max_rows=OPERATIONS_MAX_ROWS,
+                 queue_size=OPERATIONS_QUEUE_SIZE):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+
+        self.app = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._last_purge = 0
+        self._bound = False
+        self._bind_lock = threading.Lock()
+        self.dropped = 0
+
+    def init_app(self, app, lazy=False):
+        """
+        Bind the store to the Flask app and create the table if needed
+        With lazy, SQLAlchemy is only loaded (and the table created) on first use
+        """
+        app.config.setdefault("SQLALCHEMY_DATABASE_URI", database_url())
+        app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {"pool_recycle": 300, "pool_pre_ping": True})
+        if lazy:
+            # Flask refuses new extensions once an app has served a request, so the store gets its own app
+            self.app = Flask(__name__)
+            self.app.config.update({key: value for key, value in app.config.items() if key.startswith("SQLALCHEMY_")})
+        else:
+            self.app = app
+            self._bind()
+        atexit.register(self.flush)
+
+    def _bind(self):
+        if self._bound:
+            return
+        with self._bind_lock:
+            if self._bound:
+                return
+            load_models()
+            db.init_app(self.app)
+            with self.app.app_context():
+                db.create_all()
+            self._bound = True
+
+    def _context(self):
+        """App context for database work, binding the store first if it is lazy"""
+        self._bind()
+        return self.app.app_context()
+
+    def record(self, item_id, processed_subitems, remaining_value):
+        """
+        Queue an operation for the background writer
+        """
+        row = {
+            "item_id": str(item_id),
+            "timestamp": datetime.now(),
+            "remaining_value": remaining_value,
+            "processed_subitems": json.dumps(processed_subitems)
+        }
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            logger.error("Operation queue full, dropped record for item %s", item_id)
+            return
+        self._ensure_writer()
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="operation-store", daemon=True)
+                    self._writer.start()
+
+    def _next_batch(self, timeout):
+        rows = [self._queue.get(timeout=timeout)]
+        while len(rows) < self.batch_size:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _write_loop(self):
+        while True:
+            try:
+                rows = self._next_batch(self.flush_interval)
+            except queue.Empty:
+                continue
+            try:
+                self._write(rows)
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
+
+    def _write(self, rows):
+        try:
+            with self._context():
+                db.session.bulk_insert_mappings(Operation, rows)
+                db.session.commit()
+                if time.monotonic() - self._last_purge > OPERATIONS_PURGE_INTERVAL:
+                    self.purge()
+        except Exception as e:
+            logger.error("Failed to write %s operation(s): %s", len(rows), e)
+
+    def flush(self):
+        """Block until every queued operation has been written"""
+        if self._writer is not None:
+            self._queue.join()
+
+    def purge(self):
+        """
+        Apply the retention policy (must run inside an app context)
+        """
+        self._last_purge = time.monotonic()
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        deleted = Operation.query.filter(Operation.timestamp < cutoff).delete(synchronize_session=False)
+
+        newest_id = db.session.query(db.func.max(Operation.id)).scalar()
+        if newest_id is not None and self.max_rows:
+            deleted += Operation.query.filter(Operation.id <= newest_id - self.max_rows).delete(synchronize_session=False)
+
+        db.session.commit()
+        if deleted:
+            logger.info("Purged %s operation(s) past the retention policy", deleted)
+
+    def page(self, limit=50, before_id=None, item_id=None):
+        """
+        Newest operations first, paginated by id
+
+        Returns (operations, next_cursor); pass next_cursor as before_id to get the next page.
+        """
+        with self._context():
+            query = Operation.query
+            if before_id is not None:
+                query = query.filter(Operation.id < before_id)
+            if item_id is not None:
+                query = query.filter(Operation.item_id == str(item_id))
+            rows = query.order_by(Operation.id.desc()).limit(limit + 1).all()
+
+            next_cursor = rows[limit - 1].id if len(rows) > limit else None
+            return [row.to_dict() for row in rows[:limit]], next_cursor
+
+    def since(self, after_id, limit=100, item_id=None):
+        """
+        Operations newer than after_id, oldest first (used by the live feed)
+        """
+        with self._context():
+            query = Operation.query.filter(Operation.id > after_id)
+            if item_id is not None:
+                query = query.filter(Operation.item_id == str(item_id))
+            operations = [row.to_dict() for row in query.order_by(Operation.id.asc()).limit(limit).all()]
+            # End the read transaction so the next poll sees newly committed rows
+            db.session.rollback()
+            return operations
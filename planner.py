@@ -0,0 +1,184 @@
+"""
+Pure distribution planning
+
+Turns an item snapshot and its subitems into an ordered list of mutation
+operations without touching the network, so the same plan can be returned
+as a dry run, benchmarked on large boards, or handed to an executor.
+"""
+import json
+
+# Valid dropdown text values for eligible "tipo" values
+VALID_TIPO_TEXTS = (
+    "Parte Terrestre Internacional",
+    "Parte Aérea Internacional"
+)
+
+TIPO_COLUMN = "dropdown_mks6gqg0"
+PROCESSED_COLUMN = "numeric_mks6p0bv"
+EURO_DEDUCTION_COLUMN = "numeric_mks6ywg8"
+DOLLAR_DEDUCTION_COLUMN = "numeric_mks6myhs"
+DEFAULT_SUBITEM_BOARD_ID = "9431861361"
+
+
+def is_valid_currency(currency_dropdown):
+    """
+    Check the currency dropdown value - handles both text and JSON ID formats
+    """
+    if currency_dropdown in ["$ DÓLAR", "€ EURO"]:
+        return True
+    if currency_dropdown in ['{"ids":[1]}', '{"ids":[2]}', '{"ids":[3]}', '{"ids":[4]}']:
+        # Monday.com JSON format - any of these IDs are valid for processing
+        return True
+    try:
+        parsed_dropdown = json.loads(currency_dropdown)
+        if "ids" in parsed_dropdown and isinstance(parsed_dropdown["ids"], list):
+            # Accept any dropdown with valid IDs - 1 for Euro, 2-4 for Dollar variations
+            valid_ids = [1, 2, 3, 4]
+            return any(id_val in valid_ids for id_val in parsed_dropdown["ids"])
+    except (json.JSONDecodeError, TypeError):
+        # If it's not JSON, check if it contains Euro text
+        return "EURO" in currency_dropdown.upper() or "€" in currency_dropdown
+    return False
+
+
+def deduction_column_for(currency_dropdown):
+    """
+    Subitem column holding the deduction value for this currency
+    """
+    # IDs 2, 3, 4 are Dollar variants in this Monday.com dropdown; ID 1 is Euro
+    if currency_dropdown == "$ DÓLAR" or currency_dropdown.startswith(('{"ids":[2]', '{"ids":[3]', '{"ids":[4]')):
+        return DOLLAR_DEDUCTION_COLUMN
+    return EURO_DEDUCTION_COLUMN
+
+
+def scan_subitems(subitems):
+    """
+    Classify subitems by eligible tipo and whether they were already processed
+    """
+    eligible_subitems = []
+    for index, subitem in enumerate(subitems):
+        dropdown_text = subitem.text(TIPO_COLUMN)
+        if dropdown_text in VALID_TIPO_TEXTS:
+            eligible_subitems.append({
+                "subitem": subitem,
+                "index": index,
+                "is_empty": subitem.number(PROCESSED_COLUMN) == 0,
+                "dropdown_text": dropdown_text
+            })
+    return eligible_subitems
+
+
+def plan_distribution(item, subitems):
+    """
+    Build the distribution plan for an Item and its Subitem models
+
+    Returns a dict whose "status" is "ready", "invalid_currency",
+    "no_subitems", "no_eligible" or "all_processed". A ready plan carries
+    the ordered "operations" (update / split), the "processed_subitems"
+    they produce and the final "remaining_value". Processed subitems of a
+    split carry "$part1"/"$part2" references that the executor resolves to
+    the ids of the created parts.
+    """
+    numeric_value = item.numeric_value
+    currency_dropdown = item.currency
+    limit_value = item.limit_value
+
+    plan = {
+        "item_id": item.id,
+        "item_name": item.name,
+        "status": "ready",
+        "operations": [],
+        "processed_subitems": [],
+        "remaining_value": limit_value
+    }
+
+    if not is_valid_currency(currency_dropdown):
+        plan["status"] = "invalid_currency"
+        return plan
+
+    if not subitems:
+        plan["status"] = "no_subitems"
+        return plan
+
+    eligible_subitems = scan_subitems(subitems)
+    if not eligible_subitems:
+        plan["status"] = "no_eligible"
+        return plan
+
+    unprocessed_subitems = [entry["subitem"] for entry in eligible_subitems if entry["is_empty"]]
+    if not unprocessed_subitems:
+        plan["status"] = "all_processed"
+        plan["status_summary"] = {"processed": len(eligible_subitems)}
+        plan["total_eligible"] = len(eligible_subitems)
+        return plan
+
+    deduction_column = deduction_column_for(currency_dropdown)
+    plan["deduction_column"] = deduction_column
+    operations = plan["operations"]
+    processed_subitems = plan["processed_subitems"]
+
+    def add(operation):
+        operations.append(operation)
+        return len(operations) - 1
+
+    # Sequential remainder logic: limit_value (numeric_mks61nvq) is the total to distribute
+    remaining_value = limit_value
+    for subitem in unprocessed_subitems:
+        if remaining_value <= 0:
+            break
+
+        deduction_value = subitem.number(deduction_column)
+        if deduction_value <= 0:
+            continue
+
+        board_id = subitem.board_id or DEFAULT_SUBITEM_BOARD_ID
+
+        if remaining_value >= deduction_value:
+            # Normal processing - remaining value covers the deduction
+            update = add({"op": "update", "board_id": board_id, "item_id": subitem.id,
+                          "column_id": PROCESSED_COLUMN, "value": numeric_value})
+            remaining_value -= deduction_value
+            processed_subitems.append({
+                "id": subitem.id,
+                "name": subitem.name,
+                "assigned_value": numeric_value,
+                "deducted_value": deduction_value,
+                "operations": [update]
+            })
+            continue
+
+        # Remaining value is not enough - replace the subitem with Parte 1 / Parte 2.
+        # One split operation duplicates the original into both parts, Parte 1 on top.
+        part2_deduction = deduction_value - remaining_value
+        split = add({
+            "op": "split",
+            "board_id": board_id,
+            "item_id": subitem.id,
+            "name": subitem.name,
+            "parts": [
+                {"ref": "part1", "name": f"{subitem.name} Parte 1",
+                 "column_values": {deduction_column: remaining_value, PROCESSED_COLUMN: numeric_value}},
+                {"ref": "part2", "name": f"{subitem.name} Parte 2",
+                 "column_values": {deduction_column: part2_deduction}}
+            ]
+        })
+
+        processed_subitems.append({
+            "id": "$part1",
+            "name": f"{subitem.name} Parte 1",
+            "assigned_value": numeric_value,
+            "deducted_value": remaining_value,
+            "operations": [split]
+        })
+        processed_subitems.append({
+            "id": "$part2",
+            "name": f"{subitem.name} Parte 2",
+            "assigned_value": 0,  # Not processed yet
+            "deducted_value": part2_deduction,
+            "operations": [split]
+        })
+        remaining_value = 0
+        break
+
+    plan["remaining_value"] = remaining_value
+    return plan
@@ -0,0 +1,277 @@
+"""
+Opt-in profiling of selected requests
+
+With PROFILING=1, a request is profiled when it carries the X-Profile
+header, when it is picked by PROFILE_SAMPLE_RATE, or when it is a webhook
+for an item in PROFILE_ITEM_IDS. In "sample" mode a background thread
+samples the request thread's stack every PROFILE_INTERVAL seconds and the
+profile is saved as collapsed stacks (flamegraph.pl, speedscope); "full"
+mode runs cProfile and saves a pstats file (snakeviz, flameprof). Every
+profile records wall time, CPU time and the difference (time spent waiting,
+mostly on Monday.com).
+
+Monday.com calls run in asyncio.to_thread workers. Work handed to them
+through run_profiled (AsyncMondayClient does) is added to the profile of
+the request that started it: its stacks are sampled, or it gets its own
+cProfile that is merged into the saved pstats, and its CPU time counts.
+
+With PROFILING unset no hook is installed, so requests pay nothing.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import pstats
+import cProfile
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from collections import Counter
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+PROFILING = os.environ.get("PROFILING", "0") == "1"
+# "sample" (low overhead, collapsed stacks) or "full" (cProfile, pstats)
+PROFILE_MODE = os.environ.get("PROFILE_MODE", "sample")
+PROFILE_HEADER = os.environ.get("PROFILE_HEADER", "X-Profile")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_ITEM_IDS = frozenset(item_id.strip() for item_id in os.environ.get("PROFILE_ITEM_IDS", "").split(",") if item_id.strip())
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", "0.005"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "instance/profiles")
+# Only the newest profiles are kept
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "200"))
+
+EXTENSIONS = {"sample": "folded", "full": "prof"}
+
+# Profile of the request being handled; worker threads see it through their copied context
+current_profile = contextvars.ContextVar("current_profile", default=None)
+
+
+def webhook_item_id(payload):
+    """Item id of a /distribuir payload in any of its accepted formats, or None"""
+    if not isinstance(payload, dict):
+        return None
+    event = payload.get("event") or {}
+    if "pulseId" in event:
+        return event["pulseId"]
+    if "data" in event:
+        return (event["data"] or {}).get("item_id")
+    if "item" in payload:
+        return (payload["item"] or {}).get("id")
+    return payload.get("id")
+
+
+def run_profiled(func, *args):
+    """
+    Call `func` in a worker thread, inside the profile of the request that handed it over
+    asyncio.to_thread copies the caller's context, which carries current_profile
+    """
+    profile = current_profile.get()
+    if profile is None:
+        return func(*args)
+    with profile.thread():
+        return func(*args)
+
+
+def frame_label(code):
+    """Flame graph frame name; ';' separates frames in collapsed stacks"""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class _Sampler(threading.Thread):
+    """Counts the collapsed stacks of a set of threads until stopped"""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_ids = {thread_id}
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in tuple(self.thread_ids):
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                if stack:
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+class Profile:
+    """A running profile of the current thread and of the work it hands to run_profiled"""
+
+    def __init__(self, mode, interval, reason, item_id=None, path=None, request_id=None):
+        self.mode = mode
+        self.meta = {
+            "id": uuid.uuid4().hex[:12],
+            "mode": mode,
+            "reason": reason,
+            "item_id": item_id,
+            "path": path,
+            "request_id": request_id,
+            "created_at": datetime.now().isoformat()
+        }
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        self._lock = threading.Lock()
+        self._worker_cpu = 0.0
+        self._worker_profilers = []
+        self._token = current_profile.set(self)
+        if mode == "full":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._sampler = _Sampler(threading.get_ident(), interval)
+            self._sampler.start()
+
+    @contextmanager
+    def thread(self):
+        """Include the calling worker thread in this profile while the block runs"""
+        profiler = None
+        if self.mode == "full":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+ allows one active cProfile per process; it already sees this thread
+                profiler = None
+        else:
+            self._sampler.thread_ids.add(threading.get_ident())
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            cpu = time.thread_time() - cpu
+            if profiler is not None:
+                profiler.disable()
+            elif self.mode != "full":
+                self._sampler.thread_ids.discard(threading.get_ident())
+            with self._lock:
+                self._worker_cpu += cpu
+                if profiler is not None:
+                    self._worker_profilers.append(profiler)
+
+    def stats(self):
+        """pstats of a full profile, with the worker threads' profiles merged in"""
+        stats = pstats.Stats(self._profiler)
+        with self._lock:
+            for profiler in self._worker_profilers:
+                stats.add(profiler)
+        return stats
+
+    def stop(self):
+        """Stop profiling; returns the metadata with the wall/CPU split"""
+        if self.mode == "full":
+            self._profiler.disable()
+        else:
+            self._sampler.stop()
+        try:
+            current_profile.reset(self._token)
+        except ValueError:
+            # Stopped from another context than the one it started in
+            current_profile.set(None)
+        wall = time.perf_counter() - self._wall
+        # Worker CPU time counts too, so CPU can exceed wall time when calls overlap
+        cpu = time.thread_time() - self._cpu + self._worker_cpu
+        self.meta.update({
+            "wall_ms": round(wall * 1000, 2),
+            "cpu_ms": round(cpu * 1000, 2),
+            "wait_ms": round(max(0.0, wall - cpu) * 1000, 2),
+            "samples": sum(self._sampler.stacks.values()) if self.mode != "full" else None
+        })
+        return self.meta
+
+
+class RequestProfiler:
+    """
+    Chooses which requests to profile and stores their profiles in `directory`
+
+    Each profile is a data file (collapsed stacks or pstats) plus a JSON
+    file with its metadata; only the newest `keep` profiles are kept.
+    """
+
+    def __init__(self, directory=PROFILE_DIR, mode=PROFILE_MODE, sample_rate=PROFILE_SAMPLE_RATE,
+                 item_ids=PROFILE_ITEM_IDS, interval=PROFILE_INTERVAL, keep=PROFILE_KEEP):
+        self.directory = directory
+        self.mode = mode if mode in EXTENSIONS else "sample"
+        self.sample_rate = sample_rate
+        self.item_ids = item_ids
+        self.interval = interval
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def reason(self, header_requested, item_id=None):
+        """Why a request should be profiled, or None"""
+        if header_requested:
+            return "header"
+        if item_id is not None and str(item_id) in self.item_ids:
+            return "item"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def start(self, reason, **meta):
+        return Profile(self.mode, self.interval, reason, **meta)
+
+    def save(self, profile, status=None):
+        """Stop a profile and write it out; returns its metadata"""
+        meta = profile.stop()
+        meta["status"] = status
+        meta["file"] = f"{meta['id']}.{EXTENSIONS[profile.mode]}"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            data_path = os.path.join(self.directory, meta["file"])
+            if profile.mode == "full":
+                profile.stats().dump_stats(data_path)
+            else:
+                with open(data_path, "w") as f:
+                    for stack, count in profile._sampler.stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+            with open(os.path.join(self.directory, f"{meta['id']}.json"), "w") as f:
+                json.dump(meta, f)
+            self._prune()
+        except OSError as e:
+            logger.error("Could not save profile %s: %s", meta["id"], e)
+        logger.info("Profiled %s (%s): wall %sms, cpu %sms, waiting %sms", meta["path"], meta["reason"],
+                    meta["wall_ms"], meta["cpu_ms"], meta["wait_ms"])
+        return meta
+
+    def _prune(self):
+        with self._lock:
+            metas = sorted((name for name in os.listdir(self.directory) if name.endswith(".json")),
+                           key=lambda name: os.path.getmtime(os.path.join(self.directory, name)))
+            for name in metas[:max(0, len(metas) - self.keep)]:
+                profile_id = name[:-len(".json")]
+                for extension in ("json", *EXTENSIONS.values()):
+                    try:
+                        os.remove(os.path.join(self.directory, f"{profile_id}.{extension}"))
+                    except FileNotFoundError:
+                        pass
+
+    def list(self, limit=100):
+        """Metadata of the newest profiles first"""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+        profiles = []
+        for name in names:
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        profiles.sort(key=lambda meta: meta.get("created_at", ""), reverse=True)
+        return profiles[:limit]
@@ -0,0 +1,131 @@
+"""
+Projected GraphQL documents for Monday.com reads
+
+Callers declare the column ids they actually read and get back a query that
+only selects those columns. IDs, cursors and filters are always passed as
+GraphQL variables, so each distinct projection is compiled once and cached.
+"""
+import json
+from functools import lru_cache
+
+
+def _normalize(columns):
+    """Column ids as a sorted tuple (None means every column)"""
+    if columns is None:
+        return None
+    return tuple(sorted(set(columns)))
+
+
+def column_values_selection(columns, fields=("value",), indent="    "):
+    """
+    Build a `column_values` selection restricted to the given column ids
+    """
+    ids = f"(ids: {json.dumps(list(columns))})" if columns is not None else ""
+    selection = " ".join(("id",) + tuple(fields))
+    return f"{indent}column_values{ids} {{ {selection} }}"
+
+
+def _subitems_selection(subitem_columns, subitem_fields, indent):
+    return "\n".join([
+        f"{indent}subitems {{",
+        f"{indent}    id",
+        f"{indent}    name",
+        f"{indent}    board {{ id }}",
+        column_values_selection(subitem_columns, subitem_fields, indent + "    "),
+        f"{indent}}}"
+    ])
+
+
+def _items_selection(item_columns, subitem_columns, subitem_fields, include_group, indent):
+    lines = [f"{indent}id", f"{indent}name"]
+    if include_group:
+        lines.append(f"{indent}group {{ id title }}")
+    if item_columns:
+        lines.append(column_values_selection(item_columns, ("value",), indent))
+    if subitem_fields is not None:
+        lines.append(_subitems_selection(subitem_columns, subitem_fields, indent))
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=64)
+def _compile_items_query(item_columns, subitem_columns, subitem_fields):
+    return "\n".join([
+        "query($itemIds: [ID!]) {",
+        "    items(ids: $itemIds) {",
+        _items_selection(item_columns, subitem_columns, subitem_fields, False, " " * 8),
+        "    }",
+        "}"
+    ])
+
+
+def items_query(item_columns, subitem_columns=None, subitem_fields=None):
+    """
+    Query for items by id with their projected columns
+
+    Pass `subitem_fields` (e.g. ("value", "text")) to include each item's
+    subitems, restricted to `subitem_columns`. Variables: itemIds.
+    """
+    fields = tuple(subitem_fields) if subitem_fields is not None else None
+    return _compile_items_query(_normalize(item_columns), _normalize(subitem_columns), fields)
+
+
+@lru_cache(maxsize=64)
+def _compile_items_page_query(item_columns, subitem_columns, subitem_fields, include_board_fields):
+    board_fields = ["        id", "        name"] if include_board_fields else []
+    return "\n".join([
+        "query($boardIds: [ID!], $limit: Int!, $queryParams: ItemsQuery) {",
+        "    boards(ids: $boardIds) {",
+        *board_fields,
+        "        items_page(limit: $limit, query_params: $queryParams) {",
+        "            cursor",
+        "            items {",
+        _items_selection(item_columns, subitem_columns, subitem_fields, True, " " * 16),
+        "            }",
+        "        }",
+        "    }",
+        "}"
+    ])
+
+
+def items_page_query(item_columns=None, subitem_columns=None, subitem_fields=("value", "text"),
+                     include_board_fields=False):
+    """
+    First page of a board's items with projected item and subitem columns
+
+    Variables: boardIds, limit, queryParams.
+    """
+    fields = tuple(subitem_fields) if subitem_fields is not None else None
+    return _compile_items_page_query(_normalize(item_columns), _normalize(subitem_columns), fields,
+                                     include_board_fields)
+
+
+@lru_cache(maxsize=64)
+def _compile_next_items_page_query(item_columns, subitem_columns, subitem_fields):
+    return "\n".join([
+        "query($cursor: String!, $limit: Int!) {",
+        "    next_items_page(cursor: $cursor, limit: $limit) {",
+        "        cursor",
+        "        items {",
+        _items_selection(item_columns, subitem_columns, subitem_fields, True, " " * 12),
+        "        }",
+        "    }",
+        "}"
+    ])
+
+
+def next_items_page_query(item_columns=None, subitem_columns=None, subitem_fields=("value", "text")):
+    """
+    Following pages for items_page_query, with the same projection
+
+    Variables: cursor, limit.
+    """
+    fields = tuple(subitem_fields) if subitem_fields is not None else None
+    return _compile_next_items_page_query(_normalize(item_columns), _normalize(subitem_columns), fields)
+
+
+def group_rules(group_id, item_name=None):
+    """query_params rules selecting a group, and optionally an exact item name"""
+    rules = [{"column_id": "group", "compare_value": [group_id], "operator": "any_of"}]
+    if item_name:
+        rules.append({"column_id": "name", "compare_value": [item_name], "operator": "any_of"})
+    return {"rules": rules}
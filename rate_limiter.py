@@ -0,0 +1,175 @@
+import os
+import re
+import time
+import logging
+import threading
+import contextvars
+from collections import OrderedDict
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Call priorities - lower numbers are served first
+PRIORITY_HIGH = 0  # /distribuir reads and writes
+PRIORITY_LOW = 1   # diagnostics such as /explore-board and /test-api, bulk reconciliation
+
+# Priority for calls that do not pass one explicitly (bulk runs lower it for their threads)
+priority_var = contextvars.ContextVar("monday_priority", default=PRIORITY_HIGH)
+
+# Monday.com complexity budget configuration
+MONDAY_COMPLEXITY_BUDGET = int(os.environ.get("MONDAY_COMPLEXITY_BUDGET", "10000000"))
+MONDAY_COMPLEXITY_RESERVE = float(os.environ.get("MONDAY_COMPLEXITY_RESERVE", "0.2"))
+MONDAY_COMPLEXITY_ESTIMATE = int(os.environ.get("MONDAY_COMPLEXITY_ESTIMATE", "30000"))
+MONDAY_SCHEDULER_MAX_WAIT = float(os.environ.get("MONDAY_SCHEDULER_MAX_WAIT", "60"))
+
+COMPLEXITY_FIELD = "complexity { before after reset_in_x_seconds }"
+RESET_IN_PATTERN = re.compile(r"reset in (\d+) seconds?", re.IGNORECASE)
+
+
+class ComplexityBudgetExceeded(requests.exceptions.RequestException):
+    """Raised when a call cannot get complexity budget within the allowed wait"""
+
+
+def with_complexity(query):
+    """
+    Add the complexity selection to the root of a GraphQL document
+    """
+    if "complexity" in query:
+        return query
+    brace = query.find("{")
+    if brace == -1:
+        return query
+    return f"{query[:brace + 1]} {COMPLEXITY_FIELD}{query[brace + 1:]}"
+
+
+class ComplexityScheduler:
+    """
+    Shared token bucket for Monday.com's per-minute complexity budget
+
+    Every call reserves its estimated cost before it is sent. The bucket is
+    re-synchronised from the `complexity { before after reset_in_x_seconds }`
+    block Monday returns, and refilled when the reported window resets.
+    Low-priority calls may not dip into the reserved share of the budget and
+    always yield to waiting high-priority calls.
+    """
+
+    def __init__(self, budget=MONDAY_COMPLEXITY_BUDGET, reserve_ratio=MONDAY_COMPLEXITY_RESERVE,
+                 default_estimate=MONDAY_COMPLEXITY_ESTIMATE, max_wait=MONDAY_SCHEDULER_MAX_WAIT):
+        self.budget = budget
+        self.reserve = int(budget * reserve_ratio)
+        self.default_estimate = default_estimate
+        self.max_wait = max_wait
+
+        self._condition = threading.Condition()
+        self._costs = OrderedDict()
+        self.tokens = budget
+        self.reset_at = None
+        self.waiting = {PRIORITY_HIGH: 0, PRIORITY_LOW: 0}
+        self.stats = {
+            "calls": 0,
+            "throttled_calls": 0,
+            "wait_seconds": 0.0,
+            "budget_exhausted": 0,
+            "last_cost": None
+        }
+
+    def estimate(self, query):
+        """Estimated cost of a document, learned from previous responses"""
+        with self._condition:
+            return self._costs.get(query, self.default_estimate)
+
+    def _refill(self, now):
+        if self.reset_at is not None and now >= self.reset_at:
+            self.tokens = self.budget
+            self.reset_at = None
+
+    def acquire(self, cost, priority=PRIORITY_HIGH, max_wait=None):
+        """
+        Block until `cost` complexity points can be spent at this priority
+        `max_wait` shortens the configured wait (e.g. to the caller's deadline)
+        """
+        start = time.monotonic()
+        max_wait = self.max_wait if max_wait is None else max(0.0, min(max_wait, self.max_wait))
+        with self._condition:
+            self.waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+
+                    floor = self.reserve if priority == PRIORITY_LOW else 0
+                    yield_to_high = priority == PRIORITY_LOW and self.waiting[PRIORITY_HIGH] > 0
+                    if self.tokens - cost >= floor and not yield_to_high:
+                        self.tokens -= cost
+                        if self.reset_at is None:
+                            self.reset_at = now + 60
+                        break
+
+                    waited = now - start
+                    if waited >= max_wait:
+                        raise ComplexityBudgetExceeded(
+                            f"No complexity budget available after {waited:.1f}s (needed {cost}, have {self.tokens})"
+                        )
+                    timeout = self.reset_at - now if self.reset_at is not None else 1.0
+                    self._condition.wait(max(0.05, min(timeout, 1.0, max_wait - waited)))
+            finally:
+                self.waiting[priority] -= 1
+
+            waited = time.monotonic() - start
+            self.stats["calls"] += 1
+            if waited > 0.01:
+                self.stats["throttled_calls"] += 1
+                self.stats["wait_seconds"] += waited
+                logger.info("Waited %.2fs for complexity budget (priority %s, cost %s)", waited, priority, cost)
+
+    def record(self, query, response):
+        """
+        Update the bucket from a Monday.com response body
+        """
+        complexity = ((response or {}).get("data") or {}).get("complexity")
+        with self._condition:
+            if complexity and complexity.get("after") is not None:
+                cost = max(0, (complexity.get("before") or 0) - complexity["after"])
+                self.tokens = complexity["after"]
+                self.reset_at = time.monotonic() + (complexity.get("reset_in_x_seconds") or 60)
+                self.stats["last_cost"] = cost
+                self._costs[query] = cost
+                self._costs.move_to_end(query)
+                while len(self._costs) > 256:
+                    self._costs.popitem(last=False)
+            else:
+                for error in (response or {}).get("errors", []) or []:
+                    match = RESET_IN_PATTERN.search(error.get("message", ""))
+                    if match:
+                        self._exhausted(int(match.group(1)))
+                        break
+            self._condition.notify_all()
+
+    def record_exhausted(self, reset_in_seconds):
+        """Mark the budget as spent until Monday.com resets it"""
+        with self._condition:
+            self._exhausted(reset_in_seconds)
+            self._condition.notify_all()
+
+    def _exhausted(self, reset_in_seconds):
+        self.tokens = 0
+        self.reset_at = time.monotonic() + reset_in_seconds
+        self.stats["budget_exhausted"] += 1
+        logger.warning("Monday.com complexity budget exhausted, resets in %ss", reset_in_seconds)
+
+    def snapshot(self):
+        """Current scheduler state for monitoring"""
+        with self._condition:
+            reset_in = None
+            if self.reset_at is not None:
+                reset_in = max(0.0, round(self.reset_at - time.monotonic(), 1))
+            return {
+                "budget": self.budget,
+                "reserve": self.reserve,
+                "tokens": self.tokens,
+                "reset_in_seconds": reset_in,
+                "waiting_high": self.waiting[PRIORITY_HIGH],
+                "waiting_low": self.waiting[PRIORITY_LOW],
+                **self.stats,
+                "wait_seconds": round(self.stats["wait_seconds"], 3)
+            }
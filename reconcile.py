@@ -0,0 +1,235 @@
+"""
+Bulk reconciliation: distribute every qualifying item of a group in one run
+
+The group is scanned once, page by page, and each item is handed to a
+bounded pool of worker threads as soon as its page arrives. Finished item
+ids are checkpointed to a JSON file so an interrupted run can resume
+without redoing work, and progress is available while the run is going.
+"""
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from logging_setup import request_id_var
+from rate_limiter import PRIORITY_LOW, priority_var
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_BOARD_ID = os.environ.get("RECONCILE_BOARD_ID", "9431708170")
+RECONCILE_GROUP_ID = os.environ.get("RECONCILE_GROUP_ID", "group_mks6z9xe")
+RECONCILE_CONCURRENCY = int(os.environ.get("RECONCILE_CONCURRENCY", "4"))
+RECONCILE_PAGE_SIZE = int(os.environ.get("RECONCILE_PAGE_SIZE", "50"))
+RECONCILE_CHECKPOINT = os.environ.get("RECONCILE_CHECKPOINT", "instance/reconcile_checkpoint.json")
+# Checkpoint after this many finished items (and always at the end of a run)
+RECONCILE_CHECKPOINT_EVERY = int(os.environ.get("RECONCILE_CHECKPOINT_EVERY", "25"))
+
+
+class ReconcileRunning(Exception):
+    """Raised when a bulk run is started while another one is in progress"""
+
+
+class Reconciler:
+    """
+    Runs `handler(raw_item, scanned_at, dry_run)` for every item yielded by
+    `fetch_pages(board_id, group_id, page_size)`
+
+    The handler returns a (result, status_code) tuple like distribute_values.
+    At most `concurrency` items are processed at a time and at most twice
+    that many are queued, so a large group is never held in memory at once.
+    """
+
+    def __init__(self, fetch_pages, handler, board_id=RECONCILE_BOARD_ID, concurrency=RECONCILE_CONCURRENCY,
+                 page_size=RECONCILE_PAGE_SIZE, checkpoint_path=RECONCILE_CHECKPOINT):
+        self.fetch_pages = fetch_pages
+        self.handler = handler
+        self.board_id = board_id
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.checkpoint_path = checkpoint_path
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self._done = set()
+        self._since_checkpoint = 0
+        self.progress = {"status": "idle"}
+
+    def _load_checkpoint(self, group_id):
+        try:
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return set()
+        except (OSError, ValueError) as e:
+            logger.error("Ignoring unreadable reconcile checkpoint %s: %s", self.checkpoint_path, e)
+            return set()
+        if checkpoint.get("group_id") != group_id:
+            logger.warning("Checkpoint is for group %s, not %s; starting over", checkpoint.get('group_id'), group_id)
+            return set()
+        return set(checkpoint.get("done", []))
+
+    def _write_checkpoint(self):
+        with self._lock:
+            checkpoint = {
+                "run_id": self.progress["run_id"],
+                "group_id": self.progress["group_id"],
+                "updated_at": datetime.now().isoformat(),
+                "done": sorted(self._done)
+            }
+            self._since_checkpoint = 0
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(temporary, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        """Forget finished items so the next run starts from the beginning"""
+        try:
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
+
+    def _finish_item(self, item_id, outcome, dry_run):
+        with self._lock:
+            progress = self.progress
+            progress["running"] -= 1
+            progress[outcome] += 1
+            progress["last_item"] = item_id
+            # Dry runs and failures are not checkpointed, so a real or repeated run still covers them
+            if outcome in ("distributed", "skipped") and not dry_run:
+                self._done.add(item_id)
+                self._since_checkpoint += 1
+            checkpoint_due = self._since_checkpoint >= RECONCILE_CHECKPOINT_EVERY
+        if checkpoint_due:
+            self._write_checkpoint()
+
+    def _process(self, raw_item, scanned_at, dry_run, slots):
+        item_id = str(raw_item.get("id"))
+        try:
+            with self._lock:
+                self.progress["running"] += 1
+            result, status_code = self.handler(raw_item, scanned_at, dry_run)
+            if status_code >= 400:
+                outcome = "failed"
+                logger.error("Reconcile of item %s failed: %s", item_id, result.get("error"))
+            elif "processed_subitems" in result or "plan" in result:
+                outcome = "distributed"
+            else:
+                outcome = "skipped"
+        except Exception as e:
+            outcome = "failed"
+            logger.error("Reconcile of item %s failed: %s", item_id, e)
+        finally:
+            slots.release()
+        self._finish_item(item_id, outcome, dry_run)
+
+    def run(self, group_id=RECONCILE_GROUP_ID, resume=False, dry_run=False):
+        """
+        Reconcile a whole group in the calling thread and return the final progress
+        """
+        return contextvars.copy_context().run(self._run, group_id, resume, dry_run)
+
+    def _run(self, group_id, resume, dry_run):
+        with self._lock:
+            if self.progress.get("status") == "running" and self._thread is not threading.current_thread():
+                raise ReconcileRunning("A reconciliation run is already in progress")
+            self._done = self._load_checkpoint(group_id) if resume else set()
+            self._since_checkpoint = 0
+            self.progress = {
+                "run_id": uuid.uuid4().hex[:12],
+                "status": "running",
+                "group_id": group_id,
+                "dry_run": dry_run,
+                "resumed_items": len(self._done),
+                "started_at": datetime.now().isoformat(),
+                "finished_at": None,
+                "pages": 0,
+                "scanned": 0,
+                "already_done": 0,
+                "running": 0,
+                "distributed": 0,
+                "skipped": 0,
+                "failed": 0,
+                "last_item": None,
+                "error": None
+            }
+            run_id = self.progress["run_id"]
+
+        logger.info("Reconcile run %s started for group %s (resume=%s, dry_run=%s)", run_id, group_id, resume, dry_run)
+        start = time.monotonic()
+        slots = threading.BoundedSemaphore(self.concurrency * 2)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="reconcile")
+
+        # The run (and its worker threads) logs under the run id and yields the complexity budget to webhooks
+        request_id_var.set(f"reconcile-{run_id}")
+        priority_var.set(PRIORITY_LOW)
+        try:
+            for page in self.fetch_pages(self.board_id, group_id, self.page_size):
+                scanned_at = time.monotonic()
+                with self._lock:
+                    self.progress["pages"] += 1
+                for raw_item in page:
+                    with self._lock:
+                        self.progress["scanned"] += 1
+                        if str(raw_item.get("id")) in self._done:
+                            self.progress["already_done"] += 1
+                            continue
+                    slots.acquire()
+                    executor.submit(contextvars.copy_context().run, self._process, raw_item, scanned_at, dry_run, slots)
+            executor.shutdown(wait=True)
+            status = "finished"
+        except Exception as e:
+            executor.shutdown(wait=True)
+            logger.error("Reconcile run %s stopped: %s", run_id, e)
+            status = "failed"
+            with self._lock:
+                self.progress["error"] = str(e)
+
+        if not dry_run:
+            self._write_checkpoint()
+        with self._lock:
+            self.progress["status"] = status
+            self.progress["finished_at"] = datetime.now().isoformat()
+            self.progress["elapsed_seconds"] = round(time.monotonic() - start, 1)
+        logger.info("Reconcile run %s %s: %s", run_id, status, self.snapshot())
+        return self.snapshot()
+
+    def start(self, group_id=RECONCILE_GROUP_ID, resume=False, dry_run=False):
+        """
+        Reconcile a group in a background thread and return the initial progress
+        """
+        with self._lock:
+            if self.progress.get("status") == "running":
+                raise ReconcileRunning("A reconciliation run is already in progress")
+            # Mark the run as started before the thread exists so concurrent starts are rejected
+            self.progress = {"status": "running", "group_id": group_id}
+            self._thread = threading.Thread(target=self.run, args=(group_id, resume, dry_run),
+                                            name="reconcile", daemon=True)
+        self._thread.start()
+        return self.snapshot()
+
+    def wait(self, timeout=None):
+        """Wait for a background run; returns True once no run is in progress"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return thread is None or not thread.is_alive()
+
+    def snapshot(self):
+        """Progress of the current or last run"""
+        with self._lock:
+            progress = dict(self.progress)
+        if progress.get("status") == "running" and progress.get("started_at"):
+            elapsed = (datetime.now() - datetime.fromisoformat(progress["started_at"])).total_seconds()
+            finished = progress["distributed"] + progress["skipped"] + progress["failed"]
+            progress["elapsed_seconds"] = round(elapsed, 1)
+            progress["items_per_second"] = round(finished / elapsed, 2) if elapsed else 0.0
+        return progress
@@ -0,0 +1,180 @@
+"""
+Deadlines, retries and a circuit breaker for Monday.com calls
+
+A deadline set by the request (or job) that triggered the work is carried
+in a context variable, and every API call clamps its timeouts to the time
+that is left. Reads are retried with jittered backoff; writes never are.
+While the API keeps failing the breaker opens and calls fail fast instead
+of tying up workers.
+"""
+import os
+import time
+import random
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Total time a synchronous /distribuir delivery may spend on Monday.com calls
+DISTRIBUIR_DEADLINE = float(os.environ.get("DISTRIBUIR_DEADLINE", "25"))
+# Queued jobs (DISTRIBUIR_ASYNC) answer no caller, so long splits get more time
+DISTRIBUIR_JOB_DEADLINE = float(os.environ.get("DISTRIBUIR_JOB_DEADLINE", "300"))
+# Retries for idempotent reads (writes are never retried)
+MONDAY_READ_RETRIES = int(os.environ.get("MONDAY_READ_RETRIES", "2"))
+MONDAY_RETRY_BACKOFF = float(os.environ.get("MONDAY_RETRY_BACKOFF", "0.5"))
+MONDAY_RETRY_MAX_BACKOFF = float(os.environ.get("MONDAY_RETRY_MAX_BACKOFF", "5"))
+# Circuit breaker configuration
+MONDAY_BREAKER_THRESHOLD = int(os.environ.get("MONDAY_BREAKER_THRESHOLD", "5"))
+MONDAY_BREAKER_RESET = float(os.environ.get("MONDAY_BREAKER_RESET", "30"))
+
+deadline_var = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when the caller's deadline has passed before a call could be made"""
+
+
+class CircuitOpen(requests.exceptions.RequestException):
+    """Raised instead of calling Monday.com while the circuit breaker is open"""
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Limit every Monday.com call made inside the block to `seconds` in total
+    An enclosing, earlier deadline is kept
+    """
+    expires = time.monotonic() + seconds
+    current = deadline_var.get()
+    token = deadline_var.set(min(expires, current) if current is not None else expires)
+    try:
+        yield
+    finally:
+        deadline_var.reset(token)
+
+
+def remaining():
+    """Seconds left before the current deadline, or None without a deadline"""
+    expires = deadline_var.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
+
+
+def clamp_timeout(timeout):
+    """
+    A (connect, read) timeout no longer than the time left before the deadline
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded before calling Monday.com")
+    connect, read = timeout
+    return (min(connect, left), min(read, left))
+
+
+def is_transient(error):
+    """
+    Connection problems, timeouts and 5xx responses: the API looks unhealthy
+    and an idempotent read is worth retrying. 429s are left to the scheduler.
+    """
+    if isinstance(error, (DeadlineExceeded, CircuitOpen)):
+        return False
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code >= 500
+
+
+def is_unavailable(error):
+    """True when a call failed because Monday.com is down, slow or out of time (503-worthy)"""
+    return isinstance(error, (DeadlineExceeded, CircuitOpen)) or is_transient(error)
+
+
+def backoff_delay(attempt, base=MONDAY_RETRY_BACKOFF, cap=MONDAY_RETRY_MAX_BACKOFF):
+    """
+    Full-jitter exponential backoff, never past the current deadline
+    Returns None when there is no time left to wait and retry
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    left = remaining()
+    if left is not None and delay >= left:
+        return None
+    return delay
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After `threshold` consecutive failures the circuit opens and calls are
+    rejected for `reset_timeout` seconds. Then a single trial call is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, threshold=MONDAY_BREAKER_THRESHOLD, reset_timeout=MONDAY_BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self.stats = {"opened": 0, "rejected": 0, "failures": 0, "successes": 0}
+        self.last_error = None
+
+    def before_call(self):
+        """Raise CircuitOpen unless a call may go out now"""
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_running = False
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return
+            self.stats["rejected"] += 1
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        raise CircuitOpen(f"Monday.com circuit breaker is open, retry in {retry_in:.0f}s")
+
+    def record_success(self):
+        with self._lock:
+            self.stats["successes"] += 1
+            self.failures = 0
+            self._trial_running = False
+            if self.state != "closed":
+                logger.info("Monday.com circuit breaker closed")
+            self.state = "closed"
+
+    def record_failure(self, error):
+        with self._lock:
+            self.stats["failures"] += 1
+            self.failures += 1
+            self.last_error = str(error)
+            self._trial_running = False
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.threshold):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.stats["opened"] += 1
+                logger.error("Monday.com circuit breaker opened after %s failure(s): %s", self.failures, error)
+
+    def snapshot(self):
+        """Breaker state for /status"""
+        with self._lock:
+            retry_in = None
+            if self.state == "open":
+                retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)), 1)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "threshold": self.threshold,
+                "retry_in_seconds": retry_in,
+                "last_error": self.last_error,
+                **self.stats
+            }
@@ -0,0 +1,75 @@
+"""
+Cold-start settings for serverless deployments (Vercel, AWS Lambda)
+
+Every cold start imports the app before the first webhook is served, and
+that webhook would also open the first connection to Monday.com (DNS, TCP
+and TLS). In serverless mode the operation store loads SQLAlchemy on first
+use instead of at import, and a background thread connects to Monday.com
+(and loads what the webhook path imports lazily) while the rest of the app
+starts. The first API call waits for that connection instead of opening a
+second one.
+
+Measure with: python -m benchmarks.cold_start
+"""
+import os
+import time
+import logging
+import threading
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# On by default where the platform announces itself
+SERVERLESS = os.environ.get(
+    "SERVERLESS", "1" if os.environ.get("VERCEL") or os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else "0"
+) == "1"
+SERVERLESS_PREWARM = os.environ.get("SERVERLESS_PREWARM", "1") == "1"
+
+
+class ConnectionWarmup:
+    """
+    Opens a pooled connection to an API in a background thread
+
+    A HEAD request costs no API complexity; whatever it returns, the
+    connection stays in the session's pool for the first real call.
+    `tasks` run afterwards in the same thread.
+    """
+
+    def __init__(self, session, url, timeout, tasks=()):
+        self.session = session
+        self.url = url
+        self.timeout = timeout
+        self.tasks = tasks
+        self.connect_seconds = None
+
+        self._connected = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="serverless-warmup", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            self.session.head(self.url, timeout=self.timeout)
+            self.connect_seconds = time.perf_counter() - start
+            logger.debug("Connected to %s in %.0f ms", self.url, self.connect_seconds * 1000)
+        except requests.exceptions.RequestException as e:
+            logger.warning("Could not pre-warm the connection to %s: %s", self.url, e)
+        finally:
+            self._connected.set()
+        for task in self.tasks:
+            try:
+                task()
+            except Exception as e:
+                logger.warning("Warm-up task %s failed: %s", getattr(task, "__name__", task), e)
+
+    def wait(self, timeout=None):
+        """
+        Block while the connection is still being opened
+        Finishing a handshake that is already under way beats starting another one
+        """
+        if not self._connected.is_set():
+            self._connected.wait(timeout)
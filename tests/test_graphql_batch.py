@@ -0,0 +1,60 @@
+"""
+MutationBatch: aliased documents and mapping errors back to each alias
+"""
+import requests
+
+from graphql_batch import MutationBatch
+
+
+def test_errors_are_mapped_to_their_alias():
+    def send(query, variables):
+        return {
+            "data": {"u1": {"id": "10"}, "u2": None, "u3": {"id": "12"}},
+            "errors": [{"message": "Column not found", "path": ["u2"]}]
+        }
+
+    batch = MutationBatch(send)
+    first = batch.change_column_value("1", "10", "numeric", 5)
+    second = batch.change_column_value("1", "11", "missing", 5)
+    third = batch.delete_item("12")
+    results = batch.execute()
+
+    assert results[first] == {"data": {"id": "10"}, "error": None}
+    assert results[second] == {"data": None, "error": "Column not found"}
+    assert results[third]["error"] is None
+    assert batch.error_for([first, third]) is None
+    assert batch.error_for([first, second]) == "Column not found"
+
+
+def test_missing_result_gets_the_document_error():
+    batch = MutationBatch(lambda query, variables: {"data": None, "errors": [{"message": "Complexity budget exhausted"}]})
+    alias = batch.duplicate_item("1", "10")
+    assert batch.execute()[alias]["error"] == "Complexity budget exhausted"
+
+
+def test_failed_chunk_fails_only_its_aliases():
+    sent = []
+
+    def send(query, variables):
+        sent.append(variables)
+        if len(sent) == 1:
+            raise requests.exceptions.ConnectionError("down")
+        return {"data": {alias: {"id": "1"} for alias in ("u3", "u4")}}
+
+    batch = MutationBatch(send, chunk_size=2)
+    aliases = [batch.delete_item(item_id) for item_id in ("1", "2", "3", "4")]
+    results = batch.execute()
+
+    assert len(sent) == 2
+    assert [results[alias]["error"] for alias in aliases] == ["down", "down", None, None]
+    assert len(batch) == 0
+
+
+def test_document_uses_one_variable_set_per_alias():
+    query, variables = MutationBatch.build_document([
+        {"alias": "u1", "field": "delete_item", "arguments": [("item_id", "ID!", "7")], "selection": "id"},
+        {"alias": "u2", "field": "delete_item", "arguments": [("item_id", "ID!", "8")], "selection": "id"}
+    ])
+    assert "u1: delete_item(item_id: $u1_item_id) { id }" in query
+    assert "u2: delete_item(item_id: $u2_item_id) { id }" in query
+    assert variables == {"u1_item_id": "7", "u2_item_id": "8"}
@@ -0,0 +1,79 @@
+"""
+MutationJournal: begin / record / claim / release / finish
+"""
+import time
+
+import pytest
+
+from mutation_journal import MutationJournal, JournalBusy
+
+PLAN = {"item_id": "1", "operations": [{"op": "update"}], "processed_subitems": [], "remaining_value": 0}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return MutationJournal(path=str(tmp_path / "journal.db"), lease=60)
+
+
+def test_claim_without_entry(journal):
+    assert journal.claim("1") is None
+
+
+def test_claim_is_refused_while_the_run_holds_its_lease(journal):
+    journal.begin("1", PLAN)
+    with pytest.raises(JournalBusy):
+        journal.claim("1")
+
+
+def test_released_entry_is_resumed_with_its_steps(journal):
+    journal.begin("1", PLAN)
+    journal.record_steps("1", [(0, "created", {"part1": "10", "part2": "11"}), (1, "applied", None)])
+    journal.release("1")
+
+    assert journal.claim("1") == PLAN
+    assert journal.completed_steps("1") == {(0, "created"): {"part1": "10", "part2": "11"}, (1, "applied"): None}
+    # The resuming run now holds the lease itself
+    with pytest.raises(JournalBusy):
+        journal.claim("1")
+    assert journal.stats["resumed"] == 1
+
+
+def test_expired_lease_can_be_claimed(tmp_path):
+    journal = MutationJournal(path=str(tmp_path / "journal.db"), lease=0.05)
+    journal.begin("1", PLAN)
+    time.sleep(0.1)
+    assert journal.claim("1") == PLAN
+
+
+def test_recording_a_step_never_shortens_a_longer_lease(journal):
+    journal.begin("1", PLAN, lease=600)
+    journal.record_steps("1", [(0, "applied", None)])
+    (item_id, lease_until), = journal.pending()
+    assert lease_until > time.time() + 500
+
+
+def test_finish_drops_the_entry(journal):
+    journal.begin("1", PLAN)
+    journal.record_steps("1", [(0, "applied", None)])
+    journal.finish("1")
+    assert journal.pending() == []
+    assert journal.completed_steps("1") == {}
+    assert journal.claim("1") is None
+
+
+def test_begin_replaces_an_older_entry(journal):
+    journal.begin("1", PLAN)
+    journal.record_steps("1", [(0, "applied", None)])
+    journal.begin("1", {**PLAN, "remaining_value": 5})
+    journal.release("1")
+    assert journal.claim("1")["remaining_value"] == 5
+    assert journal.completed_steps("1") == {}
+
+
+def test_too_old_entry_is_dropped(tmp_path):
+    journal = MutationJournal(path=str(tmp_path / "journal.db"), lease=0, max_age=0)
+    journal.begin("1", PLAN)
+    time.sleep(0.01)
+    assert journal.claim("1") is None
+    assert journal.pending() == []
+    assert journal.stats["expired"] == 1
@@ -0,0 +1,128 @@
+"""
+Pins the distribution outcomes of the original webhook handler
+
+plan_distribution must keep producing the statuses, deduction columns,
+remainder arithmetic and Parte 1 / Parte 2 values the handler had before
+planning was split out of index.py.
+"""
+import pytest
+
+from models import Item
+from planner import (plan_distribution, PROCESSED_COLUMN, EURO_DEDUCTION_COLUMN, DOLLAR_DEDUCTION_COLUMN,
+                     DEFAULT_SUBITEM_BOARD_ID)
+
+EURO = '{"ids":[1]}'
+DOLLAR = '{"ids":[2]}'
+
+
+def subitem(subitem_id, euro=0, dollar=0, tipo="Parte Aérea Internacional", processed=None):
+    return {
+        "id": subitem_id,
+        "name": f"Subitem {subitem_id}",
+        "board": {"id": DEFAULT_SUBITEM_BOARD_ID},
+        "column_values": [
+            {"id": "dropdown_mks6gqg0", "value": None, "text": tipo},
+            {"id": PROCESSED_COLUMN, "value": f'"{processed}"' if processed is not None else None, "text": ""},
+            {"id": EURO_DEDUCTION_COLUMN, "value": f'"{euro}"', "text": ""},
+            {"id": DOLLAR_DEDUCTION_COLUMN, "value": f'"{dollar}"', "text": ""}
+        ]
+    }
+
+
+def plan(subitems, limit=100, value=42, currency=EURO):
+    item = Item.from_api({
+        "id": "1",
+        "name": "Parent",
+        "column_values": [
+            {"id": "numeric_mks63qc1", "value": f'"{value}"'},
+            {"id": "numeric_mks64nh2", "value": '"0"'},
+            {"id": "color_mks7xywc", "value": currency},
+            {"id": "numeric_mks61nvq", "value": f'"{limit}"'}
+        ],
+        "subitems": subitems
+    }, include_subitems=True)
+    return plan_distribution(item, item.subitems)
+
+
+def test_no_subitems():
+    assert plan([])["status"] == "no_subitems"
+
+
+def test_no_eligible_subitems():
+    assert plan([subitem("10", euro=30, tipo="Outro")])["status"] == "no_eligible"
+
+
+def test_all_processed():
+    result = plan([subitem("10", euro=30, processed=42), subitem("11", euro=30, processed=42)])
+    assert result["status"] == "all_processed"
+    assert result["total_eligible"] == 2
+    assert result["operations"] == []
+
+
+def test_invalid_currency():
+    assert plan([subitem("10", euro=30)], currency='{"ids":[9]}')["status"] == "invalid_currency"
+
+
+@pytest.mark.parametrize("currency, column", [
+    (EURO, EURO_DEDUCTION_COLUMN),
+    ("€ EURO", EURO_DEDUCTION_COLUMN),
+    (DOLLAR, DOLLAR_DEDUCTION_COLUMN),
+    ('{"ids":[4]}', DOLLAR_DEDUCTION_COLUMN),
+    ("$ DÓLAR", DOLLAR_DEDUCTION_COLUMN)
+])
+def test_deduction_column_follows_currency(currency, column):
+    result = plan([subitem("10", euro=30, dollar=20)], currency=currency)
+    assert result["status"] == "ready"
+    assert result["deduction_column"] == column
+    assert result["remaining_value"] == 100 - (30 if column == EURO_DEDUCTION_COLUMN else 20)
+
+
+def test_remainder_is_deducted_in_order():
+    result = plan([subitem("10", euro=30), subitem("11", euro=0), subitem("12", euro=25, processed=42),
+                   subitem("13", euro=45)], limit=100)
+    assert result["status"] == "ready"
+    assert result["remaining_value"] == 25
+    # Zero deductions are skipped and already processed subitems are left alone
+    assert [processed["id"] for processed in result["processed_subitems"]] == ["10", "13"]
+    assert [processed["deducted_value"] for processed in result["processed_subitems"]] == [30, 45]
+    assert [(operation["op"], operation["item_id"], operation["column_id"], operation["value"])
+            for operation in result["operations"]] == [
+        ("update", "10", PROCESSED_COLUMN, 42),
+        ("update", "13", PROCESSED_COLUMN, 42)
+    ]
+
+
+def test_exact_limit_leaves_nothing_to_split():
+    result = plan([subitem("10", euro=60), subitem("11", euro=40), subitem("12", euro=10)], limit=100)
+    assert result["remaining_value"] == 0
+    assert [operation["op"] for operation in result["operations"]] == ["update", "update"]
+
+
+def test_short_remainder_splits_into_parte_1_and_parte_2():
+    result = plan([subitem("10", euro=70), subitem("11", euro=50), subitem("12", euro=10)], limit=100)
+    assert result["remaining_value"] == 0
+
+    update, split = result["operations"]
+    assert update["item_id"] == "10"
+    assert split["op"] == "split"
+    assert split["item_id"] == "11"
+    part1, part2 = split["parts"]
+    assert part1["name"] == "Subitem 11 Parte 1"
+    assert part1["column_values"] == {EURO_DEDUCTION_COLUMN: 30, PROCESSED_COLUMN: 42}
+    assert part2["name"] == "Subitem 11 Parte 2"
+    assert part2["column_values"] == {EURO_DEDUCTION_COLUMN: 20}
+
+    # The subitem after the split is not touched
+    assert [(processed["name"], processed["assigned_value"], processed["deducted_value"])
+            for processed in result["processed_subitems"]] == [
+        ("Subitem 10", 42, 70),
+        ("Subitem 11 Parte 1", 42, 30),
+        ("Subitem 11 Parte 2", 0, 20)
+    ]
+
+
+def test_split_uses_the_dollar_column():
+    result = plan([subitem("10", euro=500, dollar=80)], limit=50, currency=DOLLAR)
+    part1, part2 = result["operations"][0]["parts"]
+    assert part1["column_values"] == {DOLLAR_DEDUCTION_COLUMN: 50, PROCESSED_COLUMN: 42}
+    assert part2["column_values"] == {DOLLAR_DEDUCTION_COLUMN: 30}
@@ -0,0 +1,146 @@
+"""
+/distribuir splits and their rollback, against the mock Monday.com server
+
+With 8 synthetic subitems the limit runs out on "Subitem 0-4", which is
+split into Parte 1 / Parte 2.
+"""
+import os
+import importlib
+
+import pytest
+import requests
+
+from benchmarks.mock_monday import MockMondayServer, SyntheticBoard, GraphQLError
+
+UNSPLIT = [f"Subitem 0-{position}" for position in range(8)]
+SPLIT = UNSPLIT[:4] + ["Subitem 0-4 Parte 1", "Subitem 0-4 Parte 2"] + UNSPLIT[5:]
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = MockMondayServer(board=SyntheticBoard(subitems=8)).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="module")
+def index(server, tmp_path_factory):
+    # The app reads its configuration at import time
+    directory = tmp_path_factory.mktemp("app")
+    os.environ.update(
+        MONDAY_API_URL=server.url,
+        DATABASE_URL=f"sqlite:///{directory}/operations.db",
+        MUTATION_JOURNAL_PATH=f"{directory}/mutation_journal.db",
+        MUTATION_JOURNAL_RESUME_ON_STARTUP="0",
+        MONDAY_BREAKER_THRESHOLD="1000",
+        DISTRIBUIR_ASYNC="false",
+        LOG_LEVEL="CRITICAL"
+    )
+    return importlib.import_module("index")
+
+
+@pytest.fixture
+def board(server, index):
+    server.board = SyntheticBoard(subitems=8)
+    # Item ids restart with every board, so no journal entry may leak into the next test
+    for item_id, _ in index.journal.pending():
+        index.journal.finish(item_id)
+    return server.board
+
+
+def parent(board):
+    return board.items[board.parent_ids[0]]
+
+
+def names(board):
+    return [board.items[subitem_id]["name"] for subitem_id in parent(board)["subitem_ids"]]
+
+
+def deliver(index, board, trigger_uuid=None):
+    item = parent(board)
+    event = {"pulseId": item["id"], "pulseName": item["name"]}
+    if trigger_uuid:
+        event["triggerUuid"] = trigger_uuid
+    return index.app.test_client().post("/distribuir", json={"event": event})
+
+
+def fail_once(board, field, message):
+    original = getattr(board, f"{field}_field")
+    calls = []
+
+    def flaky(arguments, selection):
+        calls.append(1)
+        if len(calls) == 1:
+            raise GraphQLError(message)
+        return original(arguments, selection)
+
+    setattr(board, f"{field}_field", flaky)
+
+
+def test_split_takes_the_original_place(index, board):
+    response = deliver(index, board)
+    assert response.status_code == 200
+    assert names(board) == SPLIT
+    assert index.journal.pending() == []
+
+
+def test_graphql_error_on_delete_rolls_the_parts_back(index, board):
+    fail_once(board, "delete_item", "Permission denied")
+
+    response = deliver(index, board, "delete-error")
+    assert response.status_code == 500
+    assert "Failed to delete item" in response.json["error"]
+    assert names(board) == UNSPLIT
+
+    # The entry stays in the journal without a lease, so the redelivery resumes it
+    (item_id, lease_until), = index.journal.pending()
+    assert lease_until == 0
+    response = deliver(index, board, "delete-error")
+    assert response.status_code == 200
+    assert response.json["message"] == "Resumed interrupted distribution"
+    assert names(board) == SPLIT
+    assert index.journal.pending() == []
+
+
+def test_failed_duplicate_rolls_back(index, board):
+    original = board.duplicate_item_field
+    calls = []
+
+    def second_fails(arguments, selection):
+        calls.append(1)
+        if len(calls) == 2:
+            raise GraphQLError("boom")
+        return original(arguments, selection)
+
+    board.duplicate_item_field = second_fails
+    response = deliver(index, board)
+    assert response.status_code == 500
+    assert names(board) == UNSPLIT
+
+
+def test_delete_that_times_out_after_applying_keeps_the_parts(index, board, monkeypatch):
+    delete_item = index.delete_item
+
+    def applied_then_timed_out(item_id, board_id="9431861361"):
+        delete_item(item_id, board_id)
+        raise requests.exceptions.ReadTimeout("late")
+
+    monkeypatch.setattr(index, "delete_item", applied_then_timed_out)
+    response = deliver(index, board)
+    assert response.status_code == 200
+    assert names(board) == SPLIT
+
+
+def test_exception_while_applying_releases_the_lease(index, board, monkeypatch):
+    def crash(plan, completed=None):
+        raise RuntimeError("worker killed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(index, "apply_plan", crash)
+        assert deliver(index, board, "crash").status_code == 500
+
+    # Not a 503 "still in progress elsewhere" until the lease runs out
+    response = deliver(index, board, "crash")
+    assert response.status_code == 200
+    assert response.json["message"] == "Resumed interrupted distribution"
+    assert names(board) == SPLIT
@@ -0,0 +1,111 @@
+"""
+WebhookCoalescer: triggerUuid deduplication and per-item serialisation
+"""
+import time
+import threading
+
+from webhook_dedup import WebhookCoalescer
+
+
+def test_duplicate_delivery_replays_a_successful_result():
+    coalescer = WebhookCoalescer(ttl=60)
+    calls = []
+
+    def run():
+        calls.append(1)
+        return {"message": "ok"}, 200
+
+    assert coalescer.run("1", "trigger", run) == ({"message": "ok"}, 200)
+    assert coalescer.run("1", "trigger", run) == ({"message": "ok"}, 200)
+    assert coalescer.lookup("trigger", "1") == ({"message": "ok"}, 200)
+    assert len(calls) == 1
+    assert coalescer.stats["duplicates"] == 2
+
+
+def test_failed_result_is_not_replayed():
+    coalescer = WebhookCoalescer(ttl=60)
+    results = iter([({"error": "down"}, 500), ({"message": "ok"}, 200)])
+
+    assert coalescer.run("1", "trigger", lambda: next(results))[1] == 500
+    # Monday.com retries a failed event with the same trigger UUID; the retry must run again
+    assert coalescer.lookup("trigger", "1") is None
+    assert coalescer.run("1", "trigger", lambda: next(results))[1] == 200
+
+
+def test_exception_is_not_replayed():
+    coalescer = WebhookCoalescer(ttl=60)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    try:
+        coalescer.run("1", "trigger", fail)
+    except RuntimeError:
+        pass
+    assert coalescer.run("1", "trigger", lambda: ({"message": "ok"}, 200))[1] == 200
+
+
+def test_other_triggers_and_items_are_not_deduplicated():
+    coalescer = WebhookCoalescer(ttl=60)
+    calls = []
+
+    def run():
+        calls.append(1)
+        return {}, 200
+
+    coalescer.run("1", "a", run)
+    coalescer.run("1", "b", run)
+    coalescer.run("2", "a", run)
+    coalescer.run("1", None, run)
+    coalescer.run("1", None, run)
+    assert len(calls) == 5
+
+
+def test_first_delivery_runs_without_waiting():
+    coalescer = WebhookCoalescer(window=5, ttl=60)
+    start = time.monotonic()
+    coalescer.run("1", "trigger", lambda: ({}, 200))
+    assert time.monotonic() - start < 1
+
+
+def test_runs_for_one_item_never_overlap_and_waiting_events_share_a_run():
+    coalescer = WebhookCoalescer(ttl=60)
+    first_started = threading.Event()
+    release_first = threading.Event()
+    running = []
+    overlaps = []
+    calls = []
+
+    def run():
+        if running:
+            overlaps.append(1)
+        running.append(1)
+        calls.append(1)
+        if len(calls) == 1:
+            first_started.set()
+            release_first.wait(5)
+        running.pop()
+        return {"run": len(calls)}, 200
+
+    results = {}
+
+    def deliver(trigger_uuid):
+        results[trigger_uuid] = coalescer.run("1", trigger_uuid, run)
+
+    first = threading.Thread(target=deliver, args=("a",))
+    first.start()
+    assert first_started.wait(5)
+    # Three more events arrive while the first run is still going
+    waiting = [threading.Thread(target=deliver, args=(trigger_uuid,)) for trigger_uuid in ("b", "c", "d")]
+    for thread in waiting:
+        thread.start()
+    time.sleep(0.1)
+    release_first.set()
+    for thread in [first, *waiting]:
+        thread.join(5)
+
+    assert overlaps == []
+    assert len(calls) == 2
+    assert results["a"] == ({"run": 1}, 200)
+    assert results["b"] == results["c"] == results["d"] == ({"run": 2}, 200)
+    assert coalescer.stats["coalesced"] == 2
@@ -0,0 +1,169 @@
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Queued jobs (DISTRIBUIR_ASYNC) wait this many seconds so deliveries for the same item merge
+WEBHOOK_COALESCE_WINDOW = float(os.environ.get("WEBHOOK_COALESCE_WINDOW", "0.5"))
+# How long a finished result is replayed to late duplicates of the same event
+WEBHOOK_RESULT_TTL = float(os.environ.get("WEBHOOK_RESULT_TTL", "300"))
+
+
+class _Flight:
+    """One pending or running distribution shared by coalesced deliveries"""
+
+    __slots__ = ("keys", "done", "result")
+
+    def __init__(self):
+        self.keys = set()
+        self.done = threading.Event()
+        self.result = None
+
+
+class WebhookCoalescer:
+    """
+    Idempotency and coalescing layer in front of distribute_values
+
+    Deliveries are keyed by (trigger UUID, item id). A repeated key gets the
+    cached result of its earlier run if that run succeeded. The first delivery
+    for an item runs right away; different events for the item that arrive
+    while it runs wait for and share the next run, and runs for the same item
+    never overlap, so a split is never applied twice. `window` only delays
+    queued jobs (see job_queue), never a synchronous webhook.
+    """
+
+    def __init__(self, window=WEBHOOK_COALESCE_WINDOW, ttl=WEBHOOK_RESULT_TTL):
+        self.window = window
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._results = {}
+        self._inflight = {}
+        self._pending = {}
+        self._item_locks = {}
+        self._finished = {}
+        self.stats = {"runs": 0, "coalesced": 0, "duplicates": 0}
+
+    @staticmethod
+    def key(trigger_uuid, item_id):
+        return (trigger_uuid, str(item_id)) if trigger_uuid else None
+
+    @staticmethod
+    def cacheable(result):
+        """
+        Only successes are replayed: Monday.com redelivers a failed event with the
+        same trigger UUID, and that retry has to run again
+        """
+        return isinstance(result, tuple) and len(result) == 2 and result[1] < 400
+
+    def _purge(self, now):
+        expired = [key for key, (expires, _) in self._results.items() if expires <= now]
+        for key in expired:
+            del self._results[key]
+        stale = [item_id for item_id, finished in self._finished.items() if finished <= now - self.ttl]
+        for item_id in stale:
+            del self._finished[item_id]
+
+    def lookup(self, trigger_uuid, item_id):
+        """Cached result for an already handled event, or None"""
+        key = self.key(trigger_uuid, item_id)
+        if key is None:
+            return None
+        with self._lock:
+            self._purge(time.monotonic())
+            cached = self._results.get(key)
+            if cached:
+                self.stats["duplicates"] += 1
+                return cached[1]
+        return None
+
+    def remember(self, trigger_uuid, item_id, result):
+        """Cache the result of an event for late duplicates"""
+        key = self.key(trigger_uuid, item_id)
+        if key is not None and self.cacheable(result):
+            with self._lock:
+                self._results[key] = (time.monotonic() + self.ttl, result)
+
+    def finished_since(self, item_id, since):
+        """
+        Whether a run for the item may have finished after `since` (a time.monotonic() value)
+        Runs are only remembered for the result TTL, so older times always count as changed
+        """
+        now = time.monotonic()
+        if since <= now - self.ttl:
+            return True
+        with self._lock:
+            finished = self._finished.get(str(item_id))
+        return finished is not None and finished >= since
+
+    def run(self, item_id, trigger_uuid, func):
+        """
+        Run `func` for a delivery, sharing or replaying results where possible
+        Returns whatever `func` returns (a (result, status_code) tuple)
+        """
+        item_id = str(item_id)
+        key = self.key(trigger_uuid, item_id)
+
+        with self._lock:
+            self._purge(time.monotonic())
+            if key in self._results:
+                self.stats["duplicates"] += 1
+                logger.info("Duplicate delivery %s for item %s, returning cached result", trigger_uuid, item_id)
+                return self._results[key][1]
+
+            flight = self._inflight.get(key) or self._pending.get(item_id)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._pending[item_id] = flight
+                item_lock = self._item_locks.setdefault(item_id, [threading.Lock(), 0])
+                item_lock[1] += 1
+            else:
+                self.stats["coalesced"] += 1
+            if key is not None:
+                flight.keys.add(key)
+                self._inflight[key] = flight
+
+        if not leader:
+            logger.info("Delivery %s for item %s coalesced into a pending run", trigger_uuid, item_id)
+            flight.done.wait()
+            return flight.result
+
+        # Deliveries arriving while an earlier run holds the lock join this flight
+        item_lock[0].acquire()
+        with self._lock:
+            if self._pending.get(item_id) is flight:
+                del self._pending[item_id]
+            self.stats["runs"] += 1
+
+        try:
+            flight.result = func()
+            return flight.result
+        except Exception:
+            flight.result = ({"error": "Internal server error"}, 500)
+            raise
+        finally:
+            item_lock[0].release()
+            with self._lock:
+                self._finished[item_id] = time.monotonic()
+                expires = time.monotonic() + self.ttl
+                for flight_key in flight.keys:
+                    if self.cacheable(flight.result):
+                        self._results[flight_key] = (expires, flight.result)
+                    self._inflight.pop(flight_key, None)
+                item_lock[1] -= 1
+                if item_lock[1] == 0:
+                    del self._item_locks[item_id]
+            flight.done.set()
+
+    def snapshot(self):
+        """Counters for /status"""
+        with self._lock:
+            return {
+                "window_seconds": self.window,
+                "cached_results": len(self._results),
+                "pending_items": len(self._pending),
+                **self.stats
+            }